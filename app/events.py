@@ -0,0 +1,67 @@
+import asyncio
+import threading
+from typing import Any, Dict, Optional, Set
+
+from .settings import Settings
+
+
+class Subscription:
+    def __init__(self, loop: asyncio.AbstractEventLoop, buffer_size: int) -> None:
+        self.loop = loop
+        self.queue: asyncio.Queue = asyncio.Queue(maxsize=max(1, buffer_size))
+        self.overflowed = False
+
+    def offer(self, event: Dict[str, Any]) -> None:
+        if self.queue.full():
+            self.queue.get_nowait()
+            self.overflowed = True
+        self.queue.put_nowait(event)
+
+    async def get(self) -> Dict[str, Any]:
+        return await self.queue.get()
+
+
+class EventBus:
+    def __init__(self, buffer_size: int) -> None:
+        self._buffer_size = buffer_size
+        self._lock = threading.Lock()
+        self._subscribers: Set[Subscription] = set()
+
+    @property
+    def subscriber_count(self) -> int:
+        return len(self._subscribers)
+
+    def subscribe(self) -> Subscription:
+        subscription = Subscription(asyncio.get_running_loop(), self._buffer_size)
+        with self._lock:
+            self._subscribers.add(subscription)
+        return subscription
+
+    def unsubscribe(self, subscription: Subscription) -> None:
+        with self._lock:
+            self._subscribers.discard(subscription)
+
+    def publish(self, event: Dict[str, Any]) -> None:
+        with self._lock:
+            subscribers = list(self._subscribers)
+        if not subscribers:
+            return
+        try:
+            current = asyncio.get_running_loop()
+        except RuntimeError:
+            current = None
+        for subscription in subscribers:
+            if subscription.loop is current:
+                subscription.offer(event)
+            elif not subscription.loop.is_closed():
+                subscription.loop.call_soon_threadsafe(subscription.offer, event)
+
+
+_BUS: Optional[EventBus] = None
+
+
+def get_event_bus(settings: Settings) -> EventBus:
+    global _BUS
+    if _BUS is None:
+        _BUS = EventBus(settings.sse_buffer_size)
+    return _BUS
@@ -0,0 +1,77 @@
+import gzip
+import hashlib
+import json
+from datetime import datetime, timedelta, timezone
+from email.utils import format_datetime, parsedate_to_datetime
+from typing import Any, Dict, Optional
+
+from fastapi import Request
+from fastapi.responses import Response
+
+
+def make_etag(*parts: Any) -> str:
+    raw = json.dumps(parts, sort_keys=True, default=str)
+    return f'W/"{hashlib.sha1(raw.encode("utf-8")).hexdigest()[:20]}"'
+
+
+def _whole_second(last_modified: datetime) -> datetime:
+    rounded = last_modified.replace(microsecond=0)
+    return rounded if rounded == last_modified else rounded + timedelta(seconds=1)
+
+
+def _cache_headers(etag: str, last_modified: Optional[datetime]) -> Dict[str, str]:
+    headers = {
+        "ETag": etag,
+        "Cache-Control": "no-cache",
+        "Vary": "Accept-Encoding, Accept-Language",
+    }
+    if last_modified is not None:
+        advertised = _whole_second(last_modified)
+        if advertised <= datetime.now(timezone.utc):
+            headers["Last-Modified"] = format_datetime(advertised, usegmt=True)
+    return headers
+
+
+def is_not_modified(request: Request, etag: str, last_modified: Optional[datetime]) -> bool:
+    if_none_match = request.headers.get("if-none-match")
+    if if_none_match is not None:
+        candidates = {candidate.strip() for candidate in if_none_match.split(",")}
+        return "*" in candidates or etag in candidates or etag.removeprefix("W/") in candidates
+    if_modified_since = request.headers.get("if-modified-since")
+    if if_modified_since and last_modified is not None:
+        try:
+            since = parsedate_to_datetime(if_modified_since)
+        except (TypeError, ValueError):
+            return False
+        if since.tzinfo is None:
+            since = since.replace(tzinfo=timezone.utc)
+        return _whole_second(last_modified) <= since
+    return False
+
+
+def not_modified_response(etag: str, last_modified: Optional[datetime]) -> Response:
+    return Response(status_code=304, headers=_cache_headers(etag, last_modified))
+
+
+def _accepts_gzip(request: Request) -> bool:
+    for part in request.headers.get("accept-encoding", "").split(","):
+        coding, _, params = part.strip().partition(";")
+        if coding.strip().lower() in {"gzip", "*"} and params.replace(" ", "") not in {"q=0", "q=0.0"}:
+            return True
+    return False
+
+
+def cached_response(
+    request: Request,
+    body: bytes,
+    media_type: str,
+    etag: str,
+    last_modified: Optional[datetime],
+    gzip_min_bytes: int,
+    headers: Optional[Dict[str, str]] = None,
+) -> Response:
+    response_headers = {**_cache_headers(etag, last_modified), **(headers or {})}
+    if gzip_min_bytes > 0 and len(body) >= gzip_min_bytes and _accepts_gzip(request):
+        body = gzip.compress(body, compresslevel=6)
+        response_headers["Content-Encoding"] = "gzip"
+    return Response(content=body, media_type=media_type, headers=response_headers)
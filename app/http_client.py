@@ -0,0 +1,144 @@
+import asyncio
+import json
+from dataclasses import dataclass
+from typing import Any, Dict, Optional
+from urllib.parse import urlsplit
+
+import aiohttp
+
+from . import tracing
+from .resilience import (
+    RETRY_STATUSES,
+    CircuitBreaker,
+    CircuitOpenError,
+    RetryPolicy,
+    ServiceUnavailableError,
+    retry_after_seconds,
+)
+from .settings import Settings
+
+
+@dataclass
+class HttpResponse:
+    status: int
+    headers: Dict[str, str]
+    body: bytes
+
+    def text(self) -> str:
+        return self.body.decode("utf-8", errors="replace")
+
+    def json(self) -> Any:
+        if not self.body:
+            return None
+        return json.loads(self.body)
+
+
+class HostRateLimiter:
+    def __init__(self, requests_per_second: int) -> None:
+        self._interval = 1.0 / requests_per_second if requests_per_second > 0 else 0.0
+        self._next_slot: Dict[str, float] = {}
+
+    async def acquire(self, host: str) -> None:
+        if not self._interval:
+            return
+        now = asyncio.get_running_loop().time()
+        slot = max(now, self._next_slot.get(host, now))
+        self._next_slot[host] = slot + self._interval
+        if slot > now:
+            await asyncio.sleep(slot - now)
+
+
+class HttpClient:
+    def __init__(self, settings: Settings) -> None:
+        self._settings = settings
+        self._session: Optional[aiohttp.ClientSession] = None
+        self._rate_limiter = HostRateLimiter(settings.http_rate_limit_per_host)
+        self._retry_policy = RetryPolicy(
+            attempts=settings.http_retry_attempts,
+            base_delay_seconds=settings.http_retry_base_delay_ms / 1000,
+            max_delay_seconds=settings.http_retry_max_delay_seconds,
+        )
+        self._breakers: Dict[str, CircuitBreaker] = {}
+
+    def _create_session(self) -> aiohttp.ClientSession:
+        settings = self._settings
+        connector = aiohttp.TCPConnector(
+            limit=settings.http_pool_limit,
+            limit_per_host=settings.http_pool_limit_per_host,
+            keepalive_timeout=settings.http_keepalive_seconds,
+            use_dns_cache=True,
+            ttl_dns_cache=settings.http_dns_cache_seconds,
+        )
+        timeout = aiohttp.ClientTimeout(total=settings.http_timeout_seconds)
+        return aiohttp.ClientSession(connector=connector, timeout=timeout)
+
+    @property
+    def session(self) -> aiohttp.ClientSession:
+        if self._session is None or self._session.closed:
+            self._session = self._create_session()
+        return self._session
+
+    def breaker(self, service: str) -> CircuitBreaker:
+        if service not in self._breakers:
+            self._breakers[service] = CircuitBreaker(
+                threshold=self._settings.circuit_breaker_threshold,
+                reset_seconds=self._settings.circuit_breaker_reset_seconds,
+            )
+        return self._breakers[service]
+
+    async def _send(self, method: str, url: str, **kwargs: Any) -> HttpResponse:
+        await self._rate_limiter.acquire(urlsplit(url).netloc)
+        async with self.session.request(method, url, **kwargs) as response:
+            body = await response.read()
+            return HttpResponse(status=response.status, headers=dict(response.headers), body=body)
+
+    async def request(self, method: str, url: str, service: Optional[str] = None, **kwargs: Any) -> HttpResponse:
+        service = service or urlsplit(url).netloc
+        breaker = self.breaker(service)
+        attempt = 0
+        while True:
+            attempt += 1
+            if not breaker.allow():
+                raise CircuitOpenError(service)
+            try:
+                response = await self._send(method, url, **kwargs)
+            except (aiohttp.ClientError, asyncio.TimeoutError) as error:
+                breaker.record_failure()
+                if attempt >= self._retry_policy.attempts:
+                    raise ServiceUnavailableError(service) from error
+                await asyncio.sleep(self._retry_policy.backoff(attempt))
+                continue
+
+            tracing.annotate(status=response.status, bytes=len(response.body), attempts=attempt)
+            if response.status >= 500:
+                breaker.record_failure()
+            else:
+                breaker.record_success()
+            if response.status not in RETRY_STATUSES or attempt >= self._retry_policy.attempts:
+                return response
+            delay = self._retry_policy.delay(attempt, retry_after_seconds(response.headers))
+            if delay is None:
+                return response
+            await asyncio.sleep(delay)
+
+    async def close(self) -> None:
+        if self._session is not None and not self._session.closed:
+            await self._session.close()
+        self._session = None
+
+
+_CLIENT: Optional[HttpClient] = None
+
+
+def get_http_client(settings: Settings) -> HttpClient:
+    global _CLIENT
+    if _CLIENT is None:
+        _CLIENT = HttpClient(settings)
+    return _CLIENT
+
+
+async def close_http_client() -> None:
+    global _CLIENT
+    if _CLIENT is not None:
+        await _CLIENT.close()
+    _CLIENT = None
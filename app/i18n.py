@@ -1,11 +1,13 @@
-from typing import Any, Dict, Optional
+from functools import lru_cache
+from string import Formatter
+from typing import Any, Dict, List, Optional, Tuple
 
 
 TRANSLATIONS: Dict[str, Dict[str, str]] = {
     "de": {
         "dashboard.title": "mealie2bring",
         "dashboard.subtitle.sync_disabled": "Automatischer Abruf deaktiviert",
-        "dashboard.subtitle.sync_interval": "Abruf alle {minutes} Minuten",
+        "dashboard.subtitle.sync_next": "Nächster Abruf {next} (Intervall {minutes} Minuten)",
         "dashboard.last_run": "Letzter Lauf",
         "dashboard.last_run.none": "Noch kein Lauf",
         "dashboard.page_generated": "Seite erstellt",
@@ -14,11 +16,18 @@ TRANSLATIONS: Dict[str, Dict[str, str]] = {
         "dashboard.log_subtitle": "Letzte 30 Tage (max).",
         "dashboard.table.time": "Zeit",
         "dashboard.table.item": "Artikel",
+        "dashboard.table.list": "Liste",
         "dashboard.table.quantity": "Menge",
         "dashboard.table.unit": "Einheit",
         "dashboard.table.bring": "Bring",
         "dashboard.table.mealie": "Mealie",
         "dashboard.table.empty": "Noch keine Einträge",
+        "dashboard.load_more": "Ältere Einträge laden",
+        "dashboard.load_more_failed": "Ältere Einträge konnten nicht geladen werden.",
+        "dashboard.traces_title": "Läufe",
+        "dashboard.traces_subtitle": "Zeitlicher Ablauf der letzten Sync-Läufe.",
+        "dashboard.traces_empty": "Noch keine Läufe",
+        "dashboard.trace.errors": "{count} Fehler",
         "dashboard.footer.project_by": "Ein Projekt von",
         "dashboard.footer.github": "GitHub",
         "dashboard.status.ok": "übernommen",
@@ -26,6 +35,10 @@ TRANSLATIONS: Dict[str, Dict[str, str]] = {
         "dashboard.notice.starting": "Manueller Sync wird gestartet …",
         "dashboard.notice.started": "Sync angestoßen. Ergebnisse folgen im Log.",
         "dashboard.notice.failed": "Sync konnte nicht gestartet werden. Bitte erneut versuchen.",
+        "dashboard.notice.progress.bring": "{pair}: {done} von {total} Artikeln an Bring übertragen …",
+        "dashboard.notice.progress.mealie": "{pair}: {done} von {total} Artikeln in Mealie abgehakt …",
+        "dashboard.notice.finished": "{pair}: Sync abgeschlossen, {count} Artikel.",
+        "dashboard.notice.finished_errors": "{pair}: Sync mit {errors} Fehlern abgeschlossen.",
         "log.sync_started": "Sync gestartet",
         "log.mealie_config_missing": "Mealie Konfiguration fehlt",
         "log.mealie_fetch_failed": "Fehler beim Abrufen der Mealie-Liste",
@@ -37,13 +50,19 @@ TRANSLATIONS: Dict[str, Dict[str, str]] = {
         "log.bring_credentials_missing": "Bring Zugangsdaten fehlen",
         "log.bring_login_failed": "Bring Login fehlgeschlagen",
         "log.bring_login_incomplete": "Bring Login Antwort unvollständig",
+        "log.bring_refresh_failed": "Bring Token konnte nicht erneuert werden",
+        "log.service_unavailable": "{service} ist nicht erreichbar",
         "log.bring_item_transferred": "An Bring übertragen",
+        "log.bring_item_unchanged": "Bereits unverändert auf der Bring-Liste",
+        "log.bring_fetch_failed": "Bring-Liste konnte nicht gelesen werden, alle Items werden geschrieben",
+        "log.bring_items_merged": "{count} Einträge für {name} zusammengefasst ({note})",
         "log.bring_item_failed": "Bring-Übertragung fehlgeschlagen",
+        "log.bring_item_already_transferred": "Bereits an Bring übertragen - nur Mealie wird aktualisiert",
     },
     "en": {
         "dashboard.title": "mealie2bring",
         "dashboard.subtitle.sync_disabled": "Automatic sync disabled",
-        "dashboard.subtitle.sync_interval": "Sync every {minutes} minutes",
+        "dashboard.subtitle.sync_next": "Next sync {next} (interval {minutes} minutes)",
         "dashboard.last_run": "Last run",
         "dashboard.last_run.none": "No runs yet",
         "dashboard.page_generated": "Page generated",
@@ -52,11 +71,18 @@ TRANSLATIONS: Dict[str, Dict[str, str]] = {
         "dashboard.log_subtitle": "Last 30 days (max).",
         "dashboard.table.time": "Time",
         "dashboard.table.item": "Item",
+        "dashboard.table.list": "List",
         "dashboard.table.quantity": "Quantity",
         "dashboard.table.unit": "Unit",
         "dashboard.table.bring": "Bring",
         "dashboard.table.mealie": "Mealie",
         "dashboard.table.empty": "No entries yet",
+        "dashboard.load_more": "Load older entries",
+        "dashboard.load_more_failed": "Older entries could not be loaded.",
+        "dashboard.traces_title": "Runs",
+        "dashboard.traces_subtitle": "Timing breakdown of the latest sync runs.",
+        "dashboard.traces_empty": "No runs yet",
+        "dashboard.trace.errors": "{count} errors",
         "dashboard.footer.project_by": "A project by",
         "dashboard.footer.github": "GitHub",
         "dashboard.status.ok": "transferred",
@@ -64,6 +90,10 @@ TRANSLATIONS: Dict[str, Dict[str, str]] = {
         "dashboard.notice.starting": "Manual sync is starting …",
         "dashboard.notice.started": "Sync started. Results will appear in the log.",
         "dashboard.notice.failed": "Sync could not be started. Please try again.",
+        "dashboard.notice.progress.bring": "{pair}: {done} of {total} items sent to Bring …",
+        "dashboard.notice.progress.mealie": "{pair}: {done} of {total} items checked off in Mealie …",
+        "dashboard.notice.finished": "{pair}: sync finished, {count} items.",
+        "dashboard.notice.finished_errors": "{pair}: sync finished with {errors} errors.",
         "log.sync_started": "Sync started",
         "log.mealie_config_missing": "Mealie configuration missing",
         "log.mealie_fetch_failed": "Failed to fetch Mealie list",
@@ -75,8 +105,14 @@ TRANSLATIONS: Dict[str, Dict[str, str]] = {
         "log.bring_credentials_missing": "Bring credentials are missing",
         "log.bring_login_failed": "Bring login failed",
         "log.bring_login_incomplete": "Bring login response incomplete",
+        "log.bring_refresh_failed": "Bring token could not be refreshed",
+        "log.service_unavailable": "{service} is unavailable",
         "log.bring_item_transferred": "Transferred to Bring",
+        "log.bring_item_unchanged": "Already on the Bring list unchanged",
+        "log.bring_fetch_failed": "Could not read the Bring list, writing all items",
+        "log.bring_items_merged": "Merged {count} entries for {name} ({note})",
         "log.bring_item_failed": "Bring transfer failed",
+        "log.bring_item_already_transferred": "Already transferred to Bring - only Mealie is updated",
     },
 }
 
@@ -86,17 +122,69 @@ class _SafeDict(dict):
         return "{" + key + "}"
 
 
+class _Message:
+    __slots__ = ("text", "parts", "static")
+
+    def __init__(self, text: str) -> None:
+        self.text = text
+        self.parts: Optional[List[Tuple[str, Optional[str]]]] = []
+        try:
+            parsed = list(Formatter().parse(text))
+        except ValueError:
+            parsed = []
+            self.parts = None
+        for literal, field, spec, conversion in parsed:
+            if field is not None and (spec or conversion or not field.isidentifier()):
+                self.parts = None
+                break
+            self.parts.append((literal, field))
+        self.static = self.parts is not None and all(field is None for _, field in self.parts)
+        if self.static:
+            self.text = "".join(literal for literal, _ in self.parts)
+
+    def render(self, context: Optional[Dict[str, Any]]) -> str:
+        if self.static:
+            return self.text
+        if self.parts is None:
+            return self.text.format_map(_SafeDict(context or {}))
+        context = context or {}
+        chunks = []
+        for literal, field in self.parts:
+            chunks.append(literal)
+            if field is not None:
+                chunks.append(str(context[field]) if field in context else "{" + field + "}")
+        return "".join(chunks)
+
+
+class Catalog:
+    def __init__(self, messages: Dict[str, str]) -> None:
+        self._messages = {key: _Message(text) for key, text in messages.items()}
+
+    def translate(self, message_key: str, context: Optional[Dict[str, Any]] = None) -> str:
+        message = self._messages.get(message_key)
+        if message is None:
+            return _Message(message_key).render(context)
+        return message.render(context)
+
+
+def _locale_messages(locale: str) -> Optional[Dict[str, str]]:
+    translations = TRANSLATIONS.get(locale)
+    if translations is None:
+        translations = TRANSLATIONS.get(locale.split("-")[0])
+    return translations
+
+
+@lru_cache(maxsize=32)
+def get_catalog(locale: str = "de", fallback_locale: str = "de") -> Catalog:
+    messages = dict(_locale_messages(fallback_locale) or {})
+    messages.update(_locale_messages(locale) or {})
+    return Catalog(messages)
+
+
 def translate(
     message_key: str,
     context: Optional[Dict[str, Any]] = None,
     locale: str = "de",
     fallback_locale: str = "de",
 ) -> str:
-    translations = TRANSLATIONS.get(locale)
-    if translations is None:
-        base_locale = locale.split("-")[0]
-        translations = TRANSLATIONS.get(base_locale)
-    if translations is None:
-        translations = TRANSLATIONS.get(fallback_locale, {})
-    message = translations.get(message_key, message_key)
-    return message.format_map(_SafeDict(context or {}))
+    return get_catalog(locale, fallback_locale).translate(message_key, context)
@@ -0,0 +1,96 @@
+import hashlib
+import json
+import sqlite3
+import threading
+import time
+from pathlib import Path
+from typing import Dict, Iterable, Optional, Set, Tuple
+
+from .settings import Settings
+
+LedgerKey = Tuple[str, str]
+
+
+def content_hash(name: Optional[str], quantity: str, unit: Optional[str]) -> str:
+    raw = json.dumps([name or "", quantity or "", unit or ""], ensure_ascii=False)
+    return hashlib.sha256(raw.encode("utf-8")).hexdigest()
+
+
+class TransferLedger:
+    def __init__(self, path: Path) -> None:
+        self._path = path
+        self._lock = threading.Lock()
+        self._connection: Optional[sqlite3.Connection] = None
+
+    def _connect(self) -> sqlite3.Connection:
+        if self._connection is None:
+            self._path.parent.mkdir(parents=True, exist_ok=True)
+            connection = sqlite3.connect(self._path, check_same_thread=False)
+            connection.execute(
+                "CREATE TABLE IF NOT EXISTS transfers ("
+                "item_id TEXT NOT NULL, "
+                "content_hash TEXT NOT NULL, "
+                "transferred_at REAL NOT NULL, "
+                "PRIMARY KEY (item_id, content_hash))"
+            )
+            connection.execute("CREATE INDEX IF NOT EXISTS transfers_transferred_at ON transfers (transferred_at)")
+            connection.commit()
+            self._connection = connection
+        return self._connection
+
+    def transferred(self, keys: Iterable[LedgerKey]) -> Set[LedgerKey]:
+        wanted = set(keys)
+        if not wanted:
+            return set()
+        with self._lock:
+            connection = self._connect()
+            item_ids = sorted({item_id for item_id, _ in wanted})
+            placeholders = ",".join("?" for _ in item_ids)
+            rows = connection.execute(
+                f"SELECT item_id, content_hash FROM transfers WHERE item_id IN ({placeholders})",
+                item_ids,
+            ).fetchall()
+        return {(item_id, digest) for item_id, digest in rows if (item_id, digest) in wanted}
+
+    def record(self, keys: Iterable[LedgerKey]) -> None:
+        now = time.time()
+        rows = [(item_id, digest, now) for item_id, digest in keys]
+        if not rows:
+            return
+        with self._lock:
+            connection = self._connect()
+            connection.executemany("INSERT OR REPLACE INTO transfers VALUES (?, ?, ?)", rows)
+            connection.commit()
+
+    def forget(self, keys: Iterable[LedgerKey]) -> None:
+        rows = list(keys)
+        if not rows:
+            return
+        with self._lock:
+            connection = self._connect()
+            connection.executemany("DELETE FROM transfers WHERE item_id = ? AND content_hash = ?", rows)
+            connection.commit()
+
+    def prune(self, max_age_seconds: float) -> None:
+        with self._lock:
+            connection = self._connect()
+            connection.execute("DELETE FROM transfers WHERE transferred_at < ?", (time.time() - max_age_seconds,))
+            connection.commit()
+
+    def close(self) -> None:
+        with self._lock:
+            if self._connection is not None:
+                self._connection.close()
+            self._connection = None
+
+
+_LEDGERS: Dict[Path, TransferLedger] = {}
+
+
+def get_ledger(settings: Settings) -> Optional[TransferLedger]:
+    path = settings.ledger_path
+    if path is None:
+        return None
+    if path not in _LEDGERS:
+        _LEDGERS[path] = TransferLedger(path)
+    return _LEDGERS[path]
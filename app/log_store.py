@@ -0,0 +1,353 @@
+import asyncio
+import json
+import logging
+import sqlite3
+import threading
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional, Sequence, Tuple
+
+from .settings import Settings
+
+logger = logging.getLogger("mealie2bring")
+
+_EPOCH = datetime(1970, 1, 1, tzinfo=timezone.utc)
+
+
+def _parse_timestamp(value: Any) -> Optional[datetime]:
+    if not value:
+        return None
+    try:
+        parsed = datetime.fromisoformat(str(value))
+    except ValueError:
+        return None
+    if parsed.tzinfo is None:
+        parsed = parsed.replace(tzinfo=timezone.utc)
+    return parsed.astimezone(timezone.utc)
+
+
+def epoch_ms(value: datetime) -> int:
+    if value.tzinfo is None:
+        value = value.replace(tzinfo=timezone.utc)
+    return (value - _EPOCH) // timedelta(milliseconds=1)
+
+
+def entry_ts(entry: Dict[str, Any]) -> Optional[int]:
+    ts = entry.get("ts")
+    if isinstance(ts, int) and not isinstance(ts, bool):
+        return ts
+    parsed = _parse_timestamp(entry.get("timestamp"))
+    return epoch_ms(parsed) if parsed is not None else None
+
+
+def _load_entry(ts: int, data: str) -> Dict[str, Any]:
+    entry = json.loads(data)
+    entry.setdefault("ts", ts)
+    return entry
+
+
+class LogStore:
+    def __init__(self, path: Path, legacy_path: Optional[Path] = None) -> None:
+        self._path = path
+        self._legacy_path = legacy_path
+        self._lock = threading.Lock()
+        self._connection: Optional[sqlite3.Connection] = None
+        self._id_lock = threading.Lock()
+        self._next_id: Optional[int] = None
+
+    def _connect(self) -> sqlite3.Connection:
+        if self._connection is None:
+            self._path.parent.mkdir(parents=True, exist_ok=True)
+            connection = sqlite3.connect(self._path, check_same_thread=False)
+            connection.execute("PRAGMA journal_mode=WAL")
+            connection.execute("PRAGMA synchronous=NORMAL")
+            connection.execute(
+                "CREATE TABLE IF NOT EXISTS entries ("
+                "id INTEGER PRIMARY KEY AUTOINCREMENT, "
+                "timestamp TEXT NOT NULL, "
+                "ts INTEGER, "
+                "type TEXT, "
+                "status TEXT, "
+                "message_key TEXT, "
+                "data TEXT NOT NULL)"
+            )
+            self._add_ts_column(connection)
+            connection.execute("CREATE INDEX IF NOT EXISTS entries_ts ON entries (ts)")
+            connection.execute("CREATE INDEX IF NOT EXISTS entries_type_ts ON entries (type, ts)")
+            connection.execute("CREATE INDEX IF NOT EXISTS entries_message_key_ts ON entries (message_key, ts)")
+            connection.execute(
+                "CREATE TABLE IF NOT EXISTS traces ("
+                "id TEXT PRIMARY KEY, "
+                "timestamp TEXT NOT NULL, "
+                "pair TEXT, "
+                "data TEXT NOT NULL)"
+            )
+            connection.execute("CREATE INDEX IF NOT EXISTS traces_timestamp ON traces (timestamp)")
+            connection.commit()
+            self._connection = connection
+            self._migrate_legacy(connection)
+        return self._connection
+
+    def _add_ts_column(self, connection: sqlite3.Connection) -> None:
+        columns = {row[1] for row in connection.execute("PRAGMA table_info(entries)")}
+        if "ts" in columns:
+            return
+        connection.execute("ALTER TABLE entries ADD COLUMN ts INTEGER")
+        rows = connection.execute("SELECT id, timestamp FROM entries").fetchall()
+        connection.executemany(
+            "UPDATE entries SET ts = ? WHERE id = ?",
+            ((entry_ts({"timestamp": timestamp}) or 0, row_id) for row_id, timestamp in rows),
+        )
+        for index in ("entries_timestamp", "entries_type", "entries_message_key"):
+            connection.execute(f"DROP INDEX IF EXISTS {index}")
+        connection.commit()
+        logger.info("Added epoch timestamps to %s log entries", len(rows))
+
+    def _migrate_legacy(self, connection: sqlite3.Connection) -> None:
+        legacy_path = self._legacy_path
+        if legacy_path is None or not legacy_path.is_file():
+            return
+        entries = []
+        with legacy_path.open(encoding="utf-8") as handle:
+            for line in handle:
+                if not line.strip():
+                    continue
+                try:
+                    entry = json.loads(line)
+                except json.JSONDecodeError:
+                    continue
+                if isinstance(entry, dict):
+                    entries.append(entry)
+        self._insert(connection, ((None, entry) for entry in entries))
+        legacy_path.rename(legacy_path.with_name(legacy_path.name + ".migrated"))
+        logger.info("Migrated %s log entries from %s", len(entries), legacy_path)
+
+    def _insert(self, connection: sqlite3.Connection, rows_in: Iterable[Tuple[Optional[int], Dict[str, Any]]]) -> None:
+        rows = []
+        for row_id, entry in rows_in:
+            ts = entry_ts(entry)
+            if ts is None:
+                continue
+            timestamp = entry.get("timestamp") if "ts" in entry else None
+            if not timestamp:
+                timestamp = (_EPOCH + timedelta(milliseconds=ts)).isoformat()
+            entry = {**entry, "timestamp": timestamp, "ts": ts}
+            rows.append((
+                row_id,
+                timestamp,
+                ts,
+                entry.get("type"),
+                entry.get("status"),
+                entry.get("message_key"),
+                json.dumps(entry, ensure_ascii=False),
+            ))
+        connection.executemany(
+            "INSERT INTO entries (id, timestamp, ts, type, status, message_key, data) VALUES (?, ?, ?, ?, ?, ?, ?)",
+            rows,
+        )
+        connection.commit()
+
+    def _stored_next_id(self) -> int:
+        with self._lock:
+            (max_id,) = self._connect().execute("SELECT COALESCE(MAX(id), 0) FROM entries").fetchone()
+        return max_id + 1
+
+    def load_next_id(self) -> None:
+        next_id = self._stored_next_id()
+        with self._id_lock:
+            if self._next_id is None:
+                self._next_id = next_id
+
+    def allocate_id(self) -> int:
+        with self._id_lock:
+            if self._next_id is None:
+                self._next_id = self._stored_next_id()
+            row_id = self._next_id
+            self._next_id += 1
+            return row_id
+
+    def append_many(self, rows: Iterable[Tuple[int, Dict[str, Any]]]) -> None:
+        with self._lock:
+            self._insert(self._connect(), rows)
+
+    def append(self, entry: Dict[str, Any]) -> int:
+        row_id = self.allocate_id()
+        self.append_many([(row_id, entry)])
+        return row_id
+
+    def prune(self, cutoff: datetime) -> int:
+        with self._lock:
+            connection = self._connect()
+            cursor = connection.execute("DELETE FROM entries WHERE ts < ?", (epoch_ms(cutoff),))
+            connection.execute("DELETE FROM traces WHERE timestamp < ?", (cutoff.isoformat(),))
+            connection.commit()
+            return cursor.rowcount
+
+    def append_trace(self, trace: Dict[str, Any]) -> None:
+        with self._lock:
+            connection = self._connect()
+            connection.execute(
+                "INSERT OR REPLACE INTO traces (id, timestamp, pair, data) VALUES (?, ?, ?, ?)",
+                (trace["id"], trace["timestamp"], trace.get("pair"), json.dumps(trace, ensure_ascii=False)),
+            )
+            connection.commit()
+
+    def recent_traces(self, limit: int, pair: Optional[str] = None) -> List[Dict[str, Any]]:
+        clauses = "WHERE pair = ? " if pair is not None else ""
+        params: List[Any] = [pair] if pair is not None else []
+        params.append(limit)
+        with self._lock:
+            rows = self._connect().execute(
+                f"SELECT data FROM traces {clauses}ORDER BY timestamp DESC LIMIT ?",
+                params,
+            ).fetchall()
+        return [json.loads(data) for (data,) in rows]
+
+    def entries_since(self, cutoff: datetime) -> List[Dict[str, Any]]:
+        with self._lock:
+            rows = self._connect().execute(
+                "SELECT ts, data FROM entries "
+                "WHERE ts >= ? AND NOT (type = 'item' AND status IS 'skipped') "
+                "ORDER BY ts DESC, id DESC",
+                (epoch_ms(cutoff),),
+            ).fetchall()
+        return [_load_entry(ts, data) for ts, data in rows]
+
+    def query(
+        self,
+        since: datetime,
+        until: Optional[datetime] = None,
+        types: Sequence[str] = (),
+        statuses: Sequence[str] = (),
+        message_keys: Sequence[str] = (),
+        before: Optional[Tuple[int, int]] = None,
+        limit: int = 100,
+    ) -> List[Tuple[int, Dict[str, Any]]]:
+        clauses = ["ts >= ?", "NOT (type = 'item' AND status IS 'skipped')"]
+        params: List[Any] = [epoch_ms(since)]
+        if until is not None:
+            clauses.append("ts < ?")
+            params.append(epoch_ms(until))
+        for column, values in (("type", types), ("status", statuses), ("message_key", message_keys)):
+            if values:
+                clauses.append(f"{column} IN ({','.join('?' for _ in values)})")
+                params.extend(values)
+        if before is not None:
+            clauses.append("(ts < ? OR (ts = ? AND id < ?))")
+            params.extend([before[0], before[0], before[1]])
+        params.append(limit)
+        with self._lock:
+            rows = self._connect().execute(
+                f"SELECT id, ts, data FROM entries WHERE {' AND '.join(clauses)} "
+                "ORDER BY ts DESC, id DESC LIMIT ?",
+                params,
+            ).fetchall()
+        return [(row_id, _load_entry(ts, data)) for row_id, ts, data in rows]
+
+    def close(self) -> None:
+        with self._lock:
+            if self._connection is not None:
+                self._connection.close()
+            self._connection = None
+
+
+class LogWriter:
+    def __init__(self, store: LogStore, batch_size: int, flush_interval_seconds: float) -> None:
+        self._store = store
+        self._batch_size = max(1, batch_size)
+        self._flush_interval = max(0.0, flush_interval_seconds)
+        self._queue: Optional[asyncio.Queue] = None
+        self._task: Optional[asyncio.Task] = None
+
+    @property
+    def running(self) -> bool:
+        return self._task is not None and not self._task.done()
+
+    def start(self) -> None:
+        if self.running:
+            return
+        self._store.load_next_id()
+        self._queue = asyncio.Queue()
+        self._task = asyncio.get_running_loop().create_task(self._run())
+
+    def submit(self, entry: Dict[str, Any]) -> int:
+        if not self.running or self._queue is None:
+            return self._store.append(entry)
+        row_id = self._store.allocate_id()
+        self._queue.put_nowait((row_id, entry))
+        return row_id
+
+    async def _next_batch(self, queue: asyncio.Queue) -> List[Tuple[int, Dict[str, Any]]]:
+        loop = asyncio.get_running_loop()
+        batch = [await queue.get()]
+        deadline = loop.time() + self._flush_interval
+        while len(batch) < self._batch_size:
+            try:
+                batch.append(queue.get_nowait())
+                continue
+            except asyncio.QueueEmpty:
+                pass
+            remaining = deadline - loop.time()
+            if remaining <= 0:
+                break
+            try:
+                batch.append(await asyncio.wait_for(queue.get(), remaining))
+            except asyncio.TimeoutError:
+                break
+        return batch
+
+    async def _run(self) -> None:
+        queue = self._queue
+        while True:
+            batch = await self._next_batch(queue)
+            try:
+                await asyncio.to_thread(self._store.append_many, batch)
+            except Exception:
+                logger.exception("Could not write %s log entries", len(batch))
+            finally:
+                for _ in batch:
+                    queue.task_done()
+
+    async def flush(self) -> None:
+        if self.running and self._queue is not None:
+            await self._queue.join()
+
+    async def stop(self) -> None:
+        await self.flush()
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+        self._task = None
+        self._queue = None
+
+
+_STORES: Dict[Path, LogStore] = {}
+_WRITER: Optional[LogWriter] = None
+
+
+def get_log_store(settings: Settings) -> LogStore:
+    path = settings.log_store_path
+    if path not in _STORES:
+        _STORES[path] = LogStore(path, legacy_path=settings.log_path)
+    return _STORES[path]
+
+
+def get_log_writer(settings: Settings) -> LogWriter:
+    global _WRITER
+    if _WRITER is None:
+        _WRITER = LogWriter(
+            get_log_store(settings),
+            batch_size=settings.log_flush_batch_size,
+            flush_interval_seconds=settings.log_flush_interval_ms / 1000,
+        )
+    return _WRITER
+
+
+async def close_log_writer() -> None:
+    global _WRITER
+    if _WRITER is not None:
+        await _WRITER.stop()
+    _WRITER = None
@@ -1,22 +1,31 @@
+import asyncio
+import hmac
 import html
 import json
 import logging
 from datetime import datetime, timezone
+from functools import lru_cache
 from pathlib import Path
 
-from fastapi import BackgroundTasks, FastAPI, Request
-from fastapi.responses import HTMLResponse
+from fastapi import BackgroundTasks, FastAPI, HTTPException, Query, Request
+from fastapi.responses import HTMLResponse, Response, StreamingResponse
 from fastapi.staticfiles import StaticFiles
 
-from .i18n import translate
-from .scheduler import create_scheduler
+from . import metrics
+from .events import get_event_bus
+from .http_cache import cached_response, is_not_modified, make_etag, not_modified_response
+from .http_client import close_http_client, get_http_client
+from .i18n import get_catalog
+from .log_store import close_log_writer, epoch_ms, get_log_writer
+from .scheduler import AdaptivePoller, JOB_PREFIX, SyncDebouncer, create_scheduler
 from .settings import Settings, get_settings
-from .sync import load_log_entries, sync_mealie_to_bring
+from .sync import LOG_VERSION, get_list_snapshot, query_log_entries, recent_traces, stream_sync, sync_mealie_to_bring
 
 logging.basicConfig(level=logging.INFO, format="%(asctime)s %(levelname)s %(message)s")
 
 app = FastAPI(title="Mealie2Bring")
 app.state.scheduler = create_scheduler()
+app.state.poller = None
 
 static_dir = Path(__file__).resolve().parent / "static"
 app.mount("/static", StaticFiles(directory=static_dir), name="static")
@@ -51,6 +60,31 @@ def _resolve_locale(request: Request, settings: Settings) -> str:
     return next(iter(settings.date_formats), "de")
 
 
+_SUB_MINUTE_CODES = ("%S", "%f", "%c", "%X", "%T", "%r", "%s")
+
+
+def _date_format(settings: Settings, locale: str) -> str:
+    format_string = settings.date_formats.get(locale)
+    if not format_string:
+        base_locale = locale.split("-")[0]
+        format_string = settings.date_formats.get(base_locale)
+    if not format_string:
+        format_string = settings.date_formats.get(settings.default_locale, "%d.%m.%Y %H:%M")
+    return format_string
+
+
+@lru_cache(maxsize=4096)
+def _format_minute(minute: int, locale: str, format_string: str) -> str:
+    return datetime.fromtimestamp(minute * 60, timezone.utc).astimezone().strftime(format_string)
+
+
+def _format_epoch(ts: int, settings: Settings, locale: str) -> str:
+    format_string = _date_format(settings, locale)
+    if any(code in format_string for code in _SUB_MINUTE_CODES):
+        return datetime.fromtimestamp(ts / 1000, timezone.utc).astimezone().strftime(format_string)
+    return _format_minute(ts // 60000, locale, format_string)
+
+
 def _format_timestamp(value: str, settings: Settings, locale: str) -> str:
     if not value:
         return ""
@@ -58,20 +92,18 @@ def _format_timestamp(value: str, settings: Settings, locale: str) -> str:
         parsed = datetime.fromisoformat(value)
     except ValueError:
         return value
-    if parsed.tzinfo is None:
-        parsed = parsed.replace(tzinfo=timezone.utc)
-    localized = parsed.astimezone()
-    format_string = settings.date_formats.get(locale)
-    if not format_string:
-        base_locale = locale.split("-")[0]
-        format_string = settings.date_formats.get(base_locale)
-    if not format_string:
-        format_string = settings.date_formats.get(settings.default_locale, "%d.%m.%Y %H:%M")
-    return localized.strftime(format_string)
+    return _format_epoch(epoch_ms(parsed), settings, locale)
+
+
+def _format_entry_time(entry: dict, settings: Settings, locale: str) -> str:
+    ts = entry.get("ts")
+    if isinstance(ts, int):
+        return _format_epoch(ts, settings, locale)
+    return _format_timestamp(entry.get("timestamp", ""), settings, locale)
 
 
 def _format_now(settings: Settings, locale: str) -> str:
-    return _format_timestamp(datetime.now(timezone.utc).isoformat(), settings, locale)
+    return _format_epoch(epoch_ms(datetime.now(timezone.utc)), settings, locale)
 
 
 def _escape_html(value: str | None) -> str:
@@ -86,44 +118,140 @@ def _translate_event(entry: dict, locale: str, settings: Settings) -> None:
     message_key = entry.get("message_key")
     if not message_key:
         return
-    entry["message"] = translate(
-        message_key,
-        entry.get("context", {}),
-        locale=locale,
-        fallback_locale=settings.fallback_locale,
-    )
+    catalog = get_catalog(locale, settings.fallback_locale)
+    entry["message"] = catalog.translate(message_key, entry.get("context", {}))
 
 
-@app.get("/", response_class=HTMLResponse)
-async def dashboard(request: Request):
-    settings = get_settings()
-    locale = _resolve_locale(request, settings)
+def _status_labels(t) -> dict:
+    return {
+        "ok": t("dashboard.status.ok"),
+    }
 
-    def t(message_key: str, context: dict | None = None) -> str:
-        return translate(
-            message_key,
-            context or {},
-            locale=locale,
-            fallback_locale=settings.fallback_locale,
-        )
 
-    entries = load_log_entries(settings)
-    for entry in entries:
-        _translate_event(entry, locale, settings)
-    last_sync_entry = next(
-        (
-            entry
-            for entry in entries
-            if entry.get("type") == "event" and entry.get("message_key") == "log.sync_started"
-        ),
-        None,
+def _mealie_labels(t) -> dict:
+    return {
+        "done": t("dashboard.mealie.done"),
+    }
+
+
+def _render_item_row(
+    entry: dict,
+    settings: Settings,
+    locale: str,
+    status_labels: dict,
+    mealie_labels: dict,
+    show_pairs: bool = False,
+) -> str:
+    status_value_raw = entry.get("status", "")
+    status_label_raw = status_labels.get(status_value_raw, status_value_raw)
+    mealie_value_raw = entry.get("mealie", "-")
+    mealie_label_raw = mealie_labels.get(mealie_value_raw, mealie_value_raw)
+    status_value = _escape_html(status_value_raw)
+    status_label = _escape_html(status_label_raw)
+    mealie_value = _escape_html(mealie_value_raw)
+    mealie_label = _escape_html(mealie_label_raw)
+    mealie_class = (
+        f" class='{mealie_value}'" if mealie_value_raw and mealie_value_raw != "-" else ""
     )
-    last_sync_display = (
-        _format_timestamp(last_sync_entry.get("timestamp", ""), settings, locale)
-        if last_sync_entry
-        else t("dashboard.last_run.none")
+    pair_cell = f"<td>{_escape_html(entry.get('pair') or '')}</td>" if show_pairs else ""
+    return (
+        f"<tr>"
+        f"<td>{_escape_html(_format_entry_time(entry, settings, locale))}</td>"
+        f"{pair_cell}"
+        f"<td>{_escape_html(entry.get('name',''))}</td>"
+        f"<td>{_escape_html(entry.get('quantity') or '')}</td>"
+        f"<td>{_escape_html(entry.get('unit') or '')}</td>"
+        f"<td class='{status_value}'>{status_label}</td>"
+        f"<td{mealie_class}>{mealie_label}</td>"
+        f"</tr>"
+    )
+
+
+def _format_duration(milliseconds: float) -> str:
+    if milliseconds >= 1000:
+        return f"{milliseconds / 1000:.2f} s"
+    return f"{milliseconds:.0f} ms"
+
+
+def _format_bytes(value: int) -> str:
+    if value >= 1024:
+        return f"{value / 1024:.1f} KiB"
+    return f"{value} B"
+
+
+def _render_trace_span(span: dict, total_ms: float) -> str:
+    attributes = span.get("attributes") or {}
+    start = span.get("start_ms", 0.0)
+    duration = span.get("duration_ms", 0.0)
+    left = min(100.0, start / total_ms * 100)
+    width = min(100.0 - left, max(0.5, duration / total_ms * 100))
+    status = attributes.get("status")
+    failed = bool(attributes.get("error")) or (isinstance(status, int) and status >= 400)
+    label = span.get("name", "")
+    if attributes.get("item"):
+        label = f"{label} · {attributes['item']}"
+    elif attributes.get("items"):
+        label = f"{label} · {attributes['items']}"
+    meta = [_format_duration(duration)]
+    if status is not None:
+        meta.append(str(status))
+    if attributes.get("bytes"):
+        meta.append(_format_bytes(attributes["bytes"]))
+    if attributes.get("attempts", 1) > 1:
+        meta.append(f"×{attributes['attempts']}")
+    if attributes.get("error"):
+        meta.append(attributes["error"])
+    bar_class = "trace-bar error" if failed else "trace-bar"
+    return (
+        f"<div class='trace-span'>"
+        f"<span class='trace-label'>{_escape_html(label)}</span>"
+        f"<span class='trace-track'><span class='{bar_class}' style='margin-left:{left:.2f}%;width:{width:.2f}%'></span></span>"
+        f"<span class='trace-meta'>{_escape_html(' · '.join(meta))}</span>"
+        f"</div>"
     )
-    page_generated = _format_now(settings, locale)
+
+
+def _render_trace(trace: dict, settings: Settings, locale: str, t, show_pairs: bool = False) -> str:
+    total_ms = max(trace.get("duration_ms") or 0.0, 0.001)
+    summary = [
+        _format_entry_time(trace, settings, locale),
+        trace.get("trigger", ""),
+        _format_duration(trace.get("duration_ms") or 0.0),
+    ]
+    if show_pairs:
+        summary.insert(1, trace.get("pair", ""))
+    if trace.get("errors"):
+        summary.append(t("dashboard.trace.errors", {"count": trace["errors"]}))
+    summary_class = " class='error'" if trace.get("errors") else ""
+    spans = "".join(_render_trace_span(span, total_ms) for span in trace.get("spans", []))
+    return (
+        f"<details class='trace'>"
+        f"<summary{summary_class}>{_escape_html(' · '.join(str(part) for part in summary))}</summary>"
+        f"<div class='trace-waterfall'>{spans}</div>"
+        f"</details>"
+    )
+
+
+def _parse_query_time(value: str | None, name: str) -> datetime | None:
+    if not value:
+        return None
+    try:
+        parsed = datetime.fromisoformat(value)
+    except ValueError:
+        raise HTTPException(status_code=400, detail=f"Invalid {name} timestamp")
+    if parsed.tzinfo is None:
+        parsed = parsed.replace(tzinfo=timezone.utc)
+    return parsed
+
+
+def _slot(name: str) -> str:
+    return f"\x00{name}\x00"
+
+
+@lru_cache(maxsize=32)
+def _dashboard_template(locale: str, show_pairs: bool) -> tuple[str, ...]:
+    settings = get_settings()
+    t = get_catalog(locale, settings.fallback_locale).translate
     custom_logo_html = ""
     if settings.dashboard_logo_url:
         escaped_logo_url = _escape_html(settings.dashboard_logo_url)
@@ -144,47 +272,21 @@ async def dashboard(request: Request):
         f'<button type="button" id="manual-trigger">{manual_trigger_label}</button>'
         "</div>"
     )
-    status_labels = {
-        "ok": t("dashboard.status.ok"),
-    }
-    mealie_labels = {
-        "done": t("dashboard.mealie.done"),
-    }
-    rows = []
-    for entry in entries:
-        if entry.get("type") != "item":
-            continue
-        status_value_raw = entry.get("status", "")
-        status_label_raw = status_labels.get(status_value_raw, status_value_raw)
-        mealie_value_raw = entry.get("mealie", "-")
-        mealie_label_raw = mealie_labels.get(mealie_value_raw, mealie_value_raw)
-        status_value = _escape_html(status_value_raw)
-        status_label = _escape_html(status_label_raw)
-        mealie_value = _escape_html(mealie_value_raw)
-        mealie_label = _escape_html(mealie_label_raw)
-        mealie_class = (
-            f" class='{mealie_value}'" if mealie_value_raw and mealie_value_raw != "-" else ""
-        )
-        rows.append(
-            f"<tr>"
-            f"<td>{_escape_html(_format_timestamp(entry.get('timestamp',''), settings, locale))}</td>"
-            f"<td>{_escape_html(entry.get('name',''))}</td>"
-            f"<td>{_escape_html(entry.get('quantity') or '')}</td>"
-            f"<td>{_escape_html(entry.get('unit') or '')}</td>"
-            f"<td class='{status_value}'>{status_label}</td>"
-            f"<td{mealie_class}>{mealie_label}</td>"
-            f"</tr>"
-        )
-
-    sync_label = (
-        t("dashboard.subtitle.sync_disabled")
-        if settings.sync_interval_minutes <= 0
-        else t("dashboard.subtitle.sync_interval", {"minutes": settings.sync_interval_minutes})
-    )
+    pair_header = f'<th>{_escape_html(t("dashboard.table.list"))}</th>' if show_pairs else ""
     translations = {
         "noticeStarting": t("dashboard.notice.starting"),
         "noticeStarted": t("dashboard.notice.started"),
         "noticeFailed": t("dashboard.notice.failed"),
+        "loadMoreFailed": t("dashboard.load_more_failed"),
+        "noticeProgress": {
+            "bring": t("dashboard.notice.progress.bring"),
+            "mealie": t("dashboard.notice.progress.mealie"),
+        },
+        "noticeFinished": t("dashboard.notice.finished"),
+        "noticeFinishedErrors": t("dashboard.notice.finished_errors"),
+        "showPairs": show_pairs,
+        "statusLabels": _status_labels(t),
+        "mealieLabels": _mealie_labels(t),
     }
     translations_json = json.dumps(translations)
     html = f"""
@@ -204,10 +306,10 @@ async def dashboard(request: Request):
               {logo_html}
               <div>
               <h1 class="title-eyebrow">{_escape_html(t("dashboard.title"))}</h1>
-              <p class="subtitle">{_escape_html(sync_label)}</p>
+              <p class="subtitle">{_slot("sync_label")}</p>
               <div class="status-meta">
-                <p class="meta-line">{_escape_html(t("dashboard.last_run"))}: {_escape_html(last_sync_display)}</p>
-                <p class="meta-line">{_escape_html(t("dashboard.page_generated"))}: {_escape_html(page_generated)}</p>
+                <p class="meta-line">{_escape_html(t("dashboard.last_run"))}: {_slot("last_run")}</p>
+                <p class="meta-line">{_escape_html(t("dashboard.page_generated"))}: {_slot("page_generated")}</p>
               </div>
               </div>
             </div>
@@ -227,6 +329,7 @@ async def dashboard(request: Request):
                 <thead>
                   <tr>
                     <th>{_escape_html(t("dashboard.table.time"))}</th>
+                    {pair_header}
                     <th>{_escape_html(t("dashboard.table.item"))}</th>
                     <th>{_escape_html(t("dashboard.table.quantity"))}</th>
                     <th>{_escape_html(t("dashboard.table.unit"))}</th>
@@ -234,11 +337,22 @@ async def dashboard(request: Request):
                     <th>{_escape_html(t("dashboard.table.mealie"))}</th>
                   </tr>
                 </thead>
-                <tbody>
-                  {''.join(rows) if rows else f'<tr><td colspan="6">{_escape_html(t("dashboard.table.empty"))}</td></tr>'}
+                <tbody id="log-rows">
+                  {_slot("rows")}
                 </tbody>
               </table>
             </div>
+            <div class="load-more">
+              <button type="button" id="load-more" data-cursor="{_slot("cursor")}"{_slot("load_more_hidden")}>{_escape_html(t("dashboard.load_more"))}</button>
+            </div>
+          </section>
+
+          <section class="panel">
+            <div class="panel-header">
+              <h2>{_escape_html(t("dashboard.traces_title"))}</h2>
+              <p>{_escape_html(t("dashboard.traces_subtitle"))}</p>
+            </div>
+            {_slot("traces")}
           </section>
         </main>
         <footer class="page-footer">
@@ -261,6 +375,69 @@ async def dashboard(request: Request):
           }}
         }};
 
+        const logRows = document.getElementById("log-rows");
+        const loadMoreButton = document.getElementById("load-more");
+
+        const appendCell = (row, text, className) => {{
+          const cell = document.createElement("td");
+          cell.textContent = text || "";
+          if (className) {{
+            cell.className = className;
+          }}
+          row.appendChild(cell);
+        }};
+
+        const fillTemplate = (template, values) => template.replace(/\{{(\w+)\}}/g, (match, key) => (
+          key in values ? String(values[key]) : match
+        ));
+
+        const buildRow = (entry) => {{
+          const row = document.createElement("tr");
+          const status = entry.status || "";
+          const mealie = entry.mealie || "-";
+          appendCell(row, entry.timestamp_display);
+          if (translations.showPairs) {{
+            appendCell(row, entry.pair);
+          }}
+          appendCell(row, entry.name);
+          appendCell(row, entry.quantity);
+          appendCell(row, entry.unit);
+          appendCell(row, translations.statusLabels[status] || status, status);
+          appendCell(row, translations.mealieLabels[mealie] || mealie, mealie !== "-" ? mealie : "");
+          return row;
+        }};
+
+        const appendEntry = (entry) => {{
+          logRows.appendChild(buildRow(entry));
+        }};
+
+        const prependEntry = (entry) => {{
+          const emptyRow = document.getElementById("log-empty");
+          if (emptyRow) {{
+            emptyRow.remove();
+          }}
+          logRows.insertBefore(buildRow(entry), logRows.firstChild);
+        }};
+
+        loadMoreButton.addEventListener("click", async () => {{
+          loadMoreButton.disabled = true;
+          try {{
+            const params = new URLSearchParams({{"type": "item", "cursor": loadMoreButton.dataset.cursor}});
+            const response = await fetch(`/api/log?${{params}}`);
+            if (!response.ok) {{
+              throw new Error("request failed");
+            }}
+            const page = await response.json();
+            page.entries.forEach(appendEntry);
+            loadMoreButton.dataset.cursor = page.next_cursor || "";
+            loadMoreButton.hidden = !page.next_cursor;
+          }} catch (error) {{
+            showNotice(translations.loadMoreFailed, "is-error");
+          }} finally {{
+            loadMoreButton.disabled = false;
+          }}
+        }});
+
         triggerButton.addEventListener("click", async () => {{
           triggerButton.disabled = true;
           showNotice(translations.noticeStarting);
@@ -277,30 +454,303 @@ async def dashboard(request: Request):
             triggerButton.disabled = false;
           }}
         }});
+
+        if (window.EventSource) {{
+          const events = new EventSource("/api/events");
+          events.addEventListener("log", (message) => {{
+            const entry = JSON.parse(message.data);
+            if (entry.type === "item") {{
+              prependEntry(entry);
+            }}
+          }});
+          events.addEventListener("progress", (message) => {{
+            const progress = JSON.parse(message.data);
+            const template = translations.noticeProgress[progress.stage];
+            if (template) {{
+              showNotice(fillTemplate(template, progress));
+            }}
+          }});
+          events.addEventListener("sync_finished", (message) => {{
+            const finished = JSON.parse(message.data);
+            if (finished.errors) {{
+              showNotice(fillTemplate(translations.noticeFinishedErrors, finished), "is-error");
+            }} else {{
+              showNotice(fillTemplate(translations.noticeFinished, {{...finished, count: finished.items}}), "is-success");
+            }}
+          }});
+          events.addEventListener("overflow", () => {{
+            events.close();
+            window.location.reload();
+          }});
+        }}
       </script>
     </html>
     """
-    return HTMLResponse(content=html)
+    return tuple(html.split("\x00"))
+
+
+def _fill_template(template: tuple[str, ...], values: dict) -> str:
+    return "".join(part if index % 2 == 0 else values[part] for index, part in enumerate(template))
+
+
+@app.get("/", response_class=HTMLResponse)
+async def dashboard(request: Request):
+    settings = get_settings()
+    locale = _resolve_locale(request, settings)
+    scheduler_status = _scheduler_status()
+    version, _ = LOG_VERSION.current()
+    etag = make_etag("dashboard", version, locale, scheduler_status)
+    if is_not_modified(request, etag, None):
+        return not_modified_response(etag, None)
+    t = get_catalog(locale, settings.fallback_locale).translate
+
+    entries, next_cursor = await asyncio.to_thread(
+        query_log_entries, settings, types=["item"], limit=settings.log_page_size
+    )
+    last_sync_entries, _ = await asyncio.to_thread(
+        query_log_entries, settings, types=["event"], message_keys=["log.sync_started"], limit=1
+    )
+    last_sync_entry = last_sync_entries[0] if last_sync_entries else None
+    traces = await asyncio.to_thread(recent_traces, settings, settings.trace_dashboard_runs)
+    last_sync_display = (
+        _format_entry_time(last_sync_entry, settings, locale)
+        if last_sync_entry
+        else t("dashboard.last_run.none")
+    )
+    status_labels = _status_labels(t)
+    mealie_labels = _mealie_labels(t)
+    show_pairs = len(settings.list_pairs) > 1
+    rows = [
+        _render_item_row(entry, settings, locale, status_labels, mealie_labels, show_pairs)
+        for entry in entries
+    ]
+    column_count = 7 if show_pairs else 6
+    trace_html = "".join(_render_trace(trace, settings, locale, t, show_pairs) for trace in traces)
+
+    scheduled = [pair for pair in scheduler_status["pairs"] if pair["next_run_at"]]
+    if scheduled:
+        upcoming = min(scheduled, key=lambda pair: pair["next_run_at"])
+        sync_label = t("dashboard.subtitle.sync_next", {
+            "next": _format_timestamp(upcoming["next_run_at"], settings, locale),
+            "minutes": max(1, round(upcoming["interval_seconds"] / 60)),
+        })
+    else:
+        sync_label = t("dashboard.subtitle.sync_disabled")
+    html = _fill_template(_dashboard_template(locale, show_pairs), {
+        "sync_label": _escape_html(sync_label),
+        "last_run": _escape_html(last_sync_display),
+        "page_generated": _escape_html(_format_now(settings, locale)),
+        "rows": "".join(rows) if rows else f'<tr id="log-empty"><td colspan="{column_count}">{_escape_html(t("dashboard.table.empty"))}</td></tr>',
+        "cursor": _escape_html(next_cursor or ""),
+        "load_more_hidden": "" if next_cursor else " hidden",
+        "traces": trace_html or f'<p>{_escape_html(t("dashboard.traces_empty"))}</p>',
+    })
+    return cached_response(
+        request, html.encode("utf-8"), "text/html; charset=utf-8", etag, None, settings.gzip_min_bytes
+    )
+
+
+def _json_bytes(content: dict) -> bytes:
+    return json.dumps(content, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+
+
+@app.get("/api/log")
+async def api_log(
+    request: Request,
+    entry_type: list[str] = Query(default=[], alias="type"),
+    status: list[str] = Query(default=[]),
+    since: str | None = None,
+    until: str | None = None,
+    cursor: str | None = None,
+    limit: int | None = Query(default=None, ge=1, le=500),
+):
+    settings = get_settings()
+    locale = _resolve_locale(request, settings)
+    version, changed_at = LOG_VERSION.current()
+    etag = make_etag("log", version, locale, request.url.query)
+    if is_not_modified(request, etag, changed_at):
+        return not_modified_response(etag, changed_at)
+    try:
+        entries, next_cursor = await asyncio.to_thread(
+            query_log_entries,
+            settings,
+            types=entry_type,
+            statuses=status,
+            since=_parse_query_time(since, "since"),
+            until=_parse_query_time(until, "until"),
+            cursor=cursor,
+            limit=limit or settings.log_page_size,
+        )
+    except ValueError:
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+    for entry in entries:
+        _translate_event(entry, locale, settings)
+        entry["timestamp_display"] = _format_entry_time(entry, settings, locale)
+    body = _json_bytes({"entries": entries, "next_cursor": next_cursor})
+    return cached_response(request, body, "application/json", etag, changed_at, settings.gzip_min_bytes)
+
+
+def _validate_pair(pair: str | None, settings: Settings) -> None:
+    if pair is not None and all(candidate.name != pair for candidate in settings.list_pairs):
+        raise HTTPException(status_code=404, detail="Unknown list pair")
+
+
+@app.get("/api/traces")
+async def api_traces(request: Request, pair: str | None = None, limit: int = Query(default=20, ge=1, le=100)):
+    settings = get_settings()
+    _validate_pair(pair, settings)
+    version, changed_at = LOG_VERSION.current()
+    etag = make_etag("traces", version, request.url.query)
+    if is_not_modified(request, etag, changed_at):
+        return not_modified_response(etag, changed_at)
+    traces = await asyncio.to_thread(recent_traces, settings, limit, pair)
+    body = _json_bytes({"traces": traces})
+    return cached_response(request, body, "application/json", etag, changed_at, settings.gzip_min_bytes)
+
+
+def _sse_message(event: str, data: dict, event_id: int | None = None) -> str:
+    lines = [f"event: {event}"]
+    if event_id is not None:
+        lines.append(f"id: {event_id}")
+    lines.append("data: " + json.dumps(data, ensure_ascii=False, separators=(",", ":")))
+    return "\n".join(lines) + "\n\n"
+
+
+async def _event_stream(request: Request, settings: Settings, locale: str):
+    bus = get_event_bus(settings)
+    subscription = bus.subscribe()
+    try:
+        yield "retry: 5000\n\n"
+        while not await request.is_disconnected():
+            try:
+                event = await asyncio.wait_for(subscription.get(), timeout=max(1, settings.sse_keepalive_seconds))
+            except asyncio.TimeoutError:
+                yield ": keepalive\n\n"
+                continue
+            if subscription.overflowed:
+                yield _sse_message("overflow", {})
+                return
+            if event["type"] == "log":
+                entry = dict(event["entry"])
+                _translate_event(entry, locale, settings)
+                entry["timestamp_display"] = _format_entry_time(entry, settings, locale)
+                yield _sse_message("log", entry, event["id"])
+            else:
+                yield _sse_message(event["type"], event)
+    finally:
+        bus.unsubscribe(subscription)
+
+
+@app.get("/api/events")
+async def api_events(request: Request):
+    settings = get_settings()
+    locale = _resolve_locale(request, settings)
+    return StreamingResponse(
+        _event_stream(request, settings, locale),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
 
 
 @app.post("/trigger")
-async def manual_sync(background_tasks: BackgroundTasks):
-    background_tasks.add_task(sync_mealie_to_bring, "manual")
+async def manual_sync(background_tasks: BackgroundTasks, pair: str | None = None):
+    _validate_pair(pair, get_settings())
+    background_tasks.add_task(sync_mealie_to_bring, "manual", pair)
     return {"status": "triggered"}
 
 
 @app.post("/api/trigger")
-async def api_trigger(background_tasks: BackgroundTasks):
-    background_tasks.add_task(sync_mealie_to_bring, "api")
+async def api_trigger(background_tasks: BackgroundTasks, pair: str | None = None):
+    _validate_pair(pair, get_settings())
+    background_tasks.add_task(sync_mealie_to_bring, "api", pair)
     return {"status": "triggered"}
 
 
+async def _ndjson_stream(pair: str | None):
+    async for record in stream_sync("api", pair):
+        yield _json_bytes(record) + b"\n"
+
+
 @app.post("/api/sync")
-async def api_sync_now():
-    results = await sync_mealie_to_bring("api")
+async def api_sync_now(request: Request, pair: str | None = None, stream: bool = False):
+    _validate_pair(pair, get_settings())
+    if stream or "application/x-ndjson" in request.headers.get("accept", ""):
+        return StreamingResponse(
+            _ndjson_stream(pair),
+            media_type="application/x-ndjson",
+            headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+        )
+    results = await sync_mealie_to_bring("api", pair)
     return {"status": "completed", "results": results}
 
 
+def _find_pairs(payload, settings: Settings) -> list[str]:
+    list_ids = {pair.mealie_shopping_list_id: pair.name for pair in settings.list_pairs}
+    found: list[str] = []
+    pending = [payload]
+    while pending:
+        value = pending.pop()
+        if isinstance(value, dict):
+            pending.extend(value.values())
+        elif isinstance(value, list):
+            pending.extend(value)
+        elif isinstance(value, str):
+            if value in list_ids and list_ids[value] not in found:
+                found.append(list_ids[value])
+            elif value[:1] in "{[":
+                try:
+                    pending.append(json.loads(value))
+                except ValueError:
+                    pass
+    return found
+
+
+@app.post("/api/webhook/mealie", status_code=202)
+async def mealie_webhook(request: Request, token: str | None = None):
+    settings = get_settings()
+    if settings.webhook_token:
+        provided = token or request.headers.get("x-webhook-token", "")
+        if not hmac.compare_digest(provided.encode("utf-8"), settings.webhook_token.encode("utf-8")):
+            raise HTTPException(status_code=401, detail="Invalid webhook token")
+    try:
+        payload = await request.json()
+    except ValueError:
+        payload = None
+    pairs = _find_pairs(payload, settings) or [pair.name for pair in settings.list_pairs]
+    for pair in pairs:
+        app.state.webhook_debouncer.notify(pair)
+        if app.state.poller is not None:
+            app.state.poller.reset(pair)
+    return {"status": "scheduled", "pairs": pairs}
+
+
+def _scheduler_status() -> dict:
+    poller = app.state.poller
+    if poller is None:
+        return {"enabled": False, "pairs": []}
+    return {
+        "enabled": True,
+        "pairs": [
+            {
+                "pair": pair_name,
+                "interval_seconds": round(state.interval_seconds),
+                "next_run_at": state.next_run_at.isoformat() if state.next_run_at else None,
+            }
+            for pair_name, state in poller.states.items()
+        ],
+    }
+
+
+@app.get("/api/scheduler")
+async def api_scheduler():
+    return _scheduler_status()
+
+
+@app.get("/metrics")
+async def metrics_endpoint():
+    return Response(metrics.render(), media_type=metrics.CONTENT_TYPE)
+
+
 @app.get("/health")
 async def health_check():
     return {"status": "ok"}
@@ -309,6 +759,13 @@ async def health_check():
 @app.on_event("startup")
 async def startup_event():
     settings = get_settings()
+    get_http_client(settings)
+    get_log_writer(settings).start()
+    app.state.webhook_debouncer = SyncDebouncer(
+        lambda pair_name: sync_mealie_to_bring("webhook", pair_name),
+        delay_seconds=settings.webhook_debounce_seconds,
+        max_delay_seconds=settings.webhook_max_delay_seconds,
+    )
     try:
         scheduler = app.state.scheduler
     except AttributeError:
@@ -320,19 +777,21 @@ async def startup_event():
         scheduler.start()
 
     for job in scheduler.get_jobs():
-        if job.id == "mealie-bring-sync":
+        if job.id.startswith(JOB_PREFIX):
             job.remove()
 
     if settings.sync_interval_minutes > 0:
-        scheduler.add_job(
-            sync_mealie_to_bring,
-            "interval",
-            minutes=settings.sync_interval_minutes,
-            id="mealie-bring-sync",
-            max_instances=1,
-            coalesce=True,
-            kwargs={"trigger": "scheduler"},
+        poller = AdaptivePoller(
+            scheduler,
+            lambda pair_name: sync_mealie_to_bring("scheduler", pair_name),
+            get_list_snapshot,
+            min_seconds=settings.sync_interval_minutes * 60,
+            max_seconds=settings.sync_max_interval_minutes * 60,
+            backoff_factor=settings.sync_backoff_factor,
+            jitter_ratio=settings.sync_jitter_percent / 100,
         )
+        poller.start(pair.name for pair in settings.list_pairs)
+        app.state.poller = poller
 
 
 @app.on_event("shutdown")
@@ -340,3 +799,8 @@ async def shutdown_event():
     scheduler = getattr(app.state, "scheduler", None)
     if scheduler and scheduler.running:
         scheduler.shutdown(wait=False)
+    debouncer = getattr(app.state, "webhook_debouncer", None)
+    if debouncer is not None:
+        await debouncer.close()
+    await close_http_client()
+    await close_log_writer()
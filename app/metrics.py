@@ -0,0 +1,83 @@
+import time
+from typing import Optional
+
+from prometheus_client import CONTENT_TYPE_LATEST, CollectorRegistry, Counter, Gauge, Histogram, generate_latest
+
+REGISTRY = CollectorRegistry()
+
+PHASE_SECONDS = Histogram(
+    "mealie2bring_phase_duration_seconds",
+    "Latency of the calls made to Mealie and Bring during a sync",
+    ["phase"],
+    buckets=(0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30),
+    registry=REGISTRY,
+)
+SYNC_SECONDS = Histogram(
+    "mealie2bring_sync_duration_seconds",
+    "Duration of a sync run per list pair",
+    ["pair"],
+    buckets=(0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30, 60, 120, 300),
+    registry=REGISTRY,
+)
+ITEMS_TRANSFERRED = Counter(
+    "mealie2bring_items_transferred_total",
+    "Items that reached Bring or were already on the Bring list",
+    ["pair"],
+    registry=REGISTRY,
+)
+ITEMS_FAILED = Counter(
+    "mealie2bring_items_failed_total",
+    "Items that could not be transferred or checked off, by reason",
+    ["pair", "reason"],
+    registry=REGISTRY,
+)
+LAST_SUCCESS = Gauge(
+    "mealie2bring_last_success_timestamp_seconds",
+    "Unix time of the last sync run that finished without errors",
+    ["pair"],
+    registry=REGISTRY,
+)
+OPEN_ITEMS = Gauge(
+    "mealie2bring_open_items",
+    "Open items in the Mealie list at the last fetch",
+    ["pair"],
+    registry=REGISTRY,
+)
+SCHEDULER_LAG = Gauge(
+    "mealie2bring_scheduler_lag_seconds",
+    "Delay between the planned and the actual start of the last scheduled sync",
+    ["pair"],
+    registry=REGISTRY,
+)
+
+
+def phase_timer(phase: str):
+    return PHASE_SECONDS.labels(phase).time()
+
+
+def record_item(pair: str, failure: Optional[str]) -> None:
+    if failure is None:
+        ITEMS_TRANSFERRED.labels(pair).inc()
+    else:
+        ITEMS_FAILED.labels(pair, failure).inc()
+
+
+def record_sync(pair: str, duration_seconds: float, succeeded: bool) -> None:
+    SYNC_SECONDS.labels(pair).observe(duration_seconds)
+    if succeeded:
+        LAST_SUCCESS.labels(pair).set(time.time())
+
+
+def record_open_items(pair: str, count: int) -> None:
+    OPEN_ITEMS.labels(pair).set(count)
+
+
+def record_scheduler_lag(pair: str, lag_seconds: float) -> None:
+    SCHEDULER_LAG.labels(pair).set(max(0.0, lag_seconds))
+
+
+def render() -> bytes:
+    return generate_latest(REGISTRY)
+
+
+CONTENT_TYPE = CONTENT_TYPE_LATEST
@@ -0,0 +1,85 @@
+import random
+import time
+from datetime import datetime, timezone
+from email.utils import parsedate_to_datetime
+from typing import Mapping, Optional
+
+RETRY_STATUSES = {429, 500, 502, 503, 504}
+
+
+class ServiceUnavailableError(Exception):
+    def __init__(self, service: str, message: Optional[str] = None) -> None:
+        super().__init__(message or f"{service} is unavailable")
+        self.service = service
+
+
+class CircuitOpenError(ServiceUnavailableError):
+    def __init__(self, service: str) -> None:
+        super().__init__(service, f"circuit for {service} is open")
+
+
+class CircuitBreaker:
+    def __init__(self, threshold: int, reset_seconds: float) -> None:
+        self._threshold = max(1, threshold)
+        self._reset_seconds = reset_seconds
+        self._failures = 0
+        self._opened_at: Optional[float] = None
+        self._trial_in_flight = False
+
+    @property
+    def is_open(self) -> bool:
+        return self._opened_at is not None
+
+    def allow(self) -> bool:
+        if self._opened_at is None:
+            return True
+        if self._trial_in_flight or time.monotonic() - self._opened_at < self._reset_seconds:
+            return False
+        self._trial_in_flight = True
+        return True
+
+    def record_success(self) -> None:
+        self._failures = 0
+        self._opened_at = None
+        self._trial_in_flight = False
+
+    def record_failure(self) -> None:
+        self._failures += 1
+        if self._trial_in_flight or self._failures >= self._threshold:
+            self._opened_at = time.monotonic()
+        self._trial_in_flight = False
+
+
+class RetryPolicy:
+    def __init__(self, attempts: int, base_delay_seconds: float, max_delay_seconds: float) -> None:
+        self.attempts = max(1, attempts)
+        self._base_delay = max(0.0, base_delay_seconds)
+        self._max_delay = max(self._base_delay, max_delay_seconds)
+
+    def backoff(self, attempt: int) -> float:
+        ceiling = min(self._max_delay, self._base_delay * 2 ** (attempt - 1))
+        return random.uniform(ceiling / 2, ceiling)
+
+    def delay(self, attempt: int, retry_after: Optional[float]) -> Optional[float]:
+        if retry_after is None:
+            return self.backoff(attempt)
+        if retry_after > self._max_delay:
+            return None
+        return max(0.0, retry_after)
+
+
+def retry_after_seconds(headers: Mapping[str, str]) -> Optional[float]:
+    value = next((item for key, item in headers.items() if key.lower() == "retry-after"), None)
+    if not value:
+        return None
+    try:
+        return float(value)
+    except ValueError:
+        pass
+    try:
+        moment = parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return None
+    if moment.tzinfo is None:
+        moment = moment.replace(tzinfo=timezone.utc)
+    return (moment - datetime.now(timezone.utc)).total_seconds()
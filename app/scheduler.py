@@ -1,5 +1,135 @@
+import asyncio
+import logging
+import random
+from dataclasses import dataclass
+from datetime import datetime, timedelta, timezone
+from typing import Any, Awaitable, Callable, Dict, Iterable, Optional, Set
+
 from apscheduler.schedulers.asyncio import AsyncIOScheduler
 
+from . import metrics
+
+logger = logging.getLogger("mealie2bring")
+
+JOB_PREFIX = "mealie-bring-sync"
+
 
 def create_scheduler() -> AsyncIOScheduler:
     return AsyncIOScheduler()
+
+
+@dataclass
+class PollState:
+    interval_seconds: float
+    next_run_at: Optional[datetime] = None
+    last_signature: Optional[str] = None
+
+
+class AdaptivePoller:
+    def __init__(
+        self,
+        scheduler: AsyncIOScheduler,
+        run: Callable[[str], Awaitable[Any]],
+        snapshot: Callable[[str], Any],
+        min_seconds: float,
+        max_seconds: float,
+        backoff_factor: float,
+        jitter_ratio: float,
+    ) -> None:
+        self._scheduler = scheduler
+        self._run = run
+        self._snapshot = snapshot
+        self._min = min_seconds
+        self._max = max(min_seconds, max_seconds)
+        self._factor = max(1.0, backoff_factor)
+        self._jitter = max(0.0, jitter_ratio)
+        self.states: Dict[str, PollState] = {}
+
+    def start(self, keys: Iterable[str]) -> None:
+        for key in keys:
+            self.states[key] = PollState(interval_seconds=self._min)
+            self._schedule(key)
+
+    def reset(self, key: str) -> None:
+        state = self.states.get(key)
+        if state is None or state.interval_seconds <= self._min:
+            return
+        state.interval_seconds = self._min
+        self._schedule(key)
+
+    def _schedule(self, key: str) -> None:
+        state = self.states[key]
+        delay = state.interval_seconds * (1 + random.uniform(-self._jitter, self._jitter))
+        delay = min(self._max, max(self._min, delay))
+        state.next_run_at = datetime.now(timezone.utc) + timedelta(seconds=delay)
+        self._scheduler.add_job(
+            self._run_job,
+            "date",
+            run_date=state.next_run_at,
+            id=f"{JOB_PREFIX}:{key}",
+            replace_existing=True,
+            misfire_grace_time=None,
+            kwargs={"key": key},
+        )
+
+    def _next_interval(self, state: PollState, snapshot: Any) -> float:
+        if snapshot is None:
+            return state.interval_seconds
+        changed = state.last_signature is not None and snapshot.signature != state.last_signature
+        state.last_signature = snapshot.signature
+        if snapshot.open_items > 0 or changed:
+            return self._min
+        return min(self._max, state.interval_seconds * self._factor)
+
+    async def _run_job(self, key: str) -> None:
+        state = self.states[key]
+        if state.next_run_at is not None:
+            metrics.record_scheduler_lag(key, (datetime.now(timezone.utc) - state.next_run_at).total_seconds())
+        try:
+            await self._run(key)
+        except Exception:
+            logger.exception("Scheduled sync for %s failed", key)
+        finally:
+            state.interval_seconds = self._next_interval(state, self._snapshot(key))
+            self._schedule(key)
+
+
+class SyncDebouncer:
+    def __init__(
+        self,
+        run: Callable[[Optional[str]], Awaitable[Any]],
+        delay_seconds: float,
+        max_delay_seconds: float,
+    ) -> None:
+        self._run = run
+        self._delay = max(0.0, delay_seconds)
+        self._max_delay = max(self._delay, max_delay_seconds)
+        self._first_seen: Dict[Optional[str], float] = {}
+        self._handles: Dict[Optional[str], asyncio.TimerHandle] = {}
+        self._tasks: Set[asyncio.Task] = set()
+
+    def notify(self, key: Optional[str]) -> None:
+        loop = asyncio.get_running_loop()
+        now = loop.time()
+        first_seen = self._first_seen.setdefault(key, now)
+        handle = self._handles.pop(key, None)
+        if handle is not None:
+            handle.cancel()
+        fire_at = min(now + self._delay, first_seen + self._max_delay)
+        self._handles[key] = loop.call_at(fire_at, self._fire, key)
+
+    def _fire(self, key: Optional[str]) -> None:
+        self._handles.pop(key, None)
+        self._first_seen.pop(key, None)
+        task = asyncio.get_running_loop().create_task(self._run(key))
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+
+    async def close(self) -> None:
+        for handle in self._handles.values():
+            handle.cancel()
+        self._handles.clear()
+        self._first_seen.clear()
+        for task in list(self._tasks):
+            task.cancel()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
@@ -1,8 +1,12 @@
+import json
+import logging
 import os
 from dataclasses import dataclass
 from functools import lru_cache
 from pathlib import Path
-from typing import Dict, Optional
+from typing import Dict, Optional, Tuple
+
+logger = logging.getLogger("mealie2bring")
 
 
 def _env_int(name: str, default: int) -> int:
@@ -15,6 +19,58 @@ def _env_int(name: str, default: int) -> int:
         return default
 
 
+def _env_float(name: str, default: float) -> float:
+    value = os.getenv(name)
+    if value is None:
+        return default
+    try:
+        return float(value)
+    except ValueError:
+        return default
+
+
+def _env_path(name: str, default: str) -> Optional[Path]:
+    value = os.getenv(name, default)
+    if not value:
+        return None
+    return Path(value)
+
+
+@dataclass(frozen=True)
+class ListPair:
+    name: str
+    mealie_shopping_list_id: str
+    bring_list_uuid: Optional[str]
+
+
+def _env_list_pairs(name: str, default: ListPair) -> Tuple[ListPair, ...]:
+    value = os.getenv(name)
+    if not value:
+        return (default,)
+    try:
+        raw_pairs = json.loads(value)
+    except ValueError:
+        logger.error("%s is not valid JSON, falling back to MEALIE_SHOPPING_LIST_ID", name)
+        return (default,)
+    pairs = []
+    names = set()
+    for index, raw in enumerate(raw_pairs if isinstance(raw_pairs, list) else []):
+        if not isinstance(raw, dict) or not raw.get("mealie_shopping_list_id"):
+            logger.error("Ignoring invalid entry %s in %s", index, name)
+            continue
+        pair_name = str(raw.get("name") or f"list-{index + 1}")
+        if pair_name in names:
+            logger.error("Ignoring duplicate list name %s in %s", pair_name, name)
+            continue
+        names.add(pair_name)
+        pairs.append(ListPair(
+            name=pair_name,
+            mealie_shopping_list_id=str(raw["mealie_shopping_list_id"]),
+            bring_list_uuid=raw.get("bring_list_uuid") or default.bring_list_uuid,
+        ))
+    return tuple(pairs) or (default,)
+
+
 @dataclass(frozen=True)
 class Settings:
     mealie_base_url: str
@@ -23,19 +79,59 @@ class Settings:
     bring_email: str
     bring_password: str
     bring_list_uuid: Optional[str]
+    list_pairs: Tuple[ListPair, ...]
+    bring_base_url: str
+    bring_auth_cache_path: Optional[Path]
+    bring_token_refresh_margin_seconds: int
+    bring_batch_size: int
     sync_interval_minutes: int
+    sync_max_interval_minutes: int
+    sync_backoff_factor: float
+    sync_jitter_percent: int
+    sync_concurrency: int
+    webhook_token: str
+    webhook_debounce_seconds: int
+    webhook_max_delay_seconds: int
+    mealie_mark_done_batch_size: int
     log_path: Path
+    log_store_path: Path
     log_retention_days: int
+    log_flush_batch_size: int
+    log_flush_interval_ms: int
+    log_page_size: int
+    log_cache_size: int
+    trace_dashboard_runs: int
+    ledger_path: Optional[Path]
     port: int
     dashboard_logo_url: Optional[str]
     ui_locale: Optional[str]
     default_locale: str
     fallback_locale: str
     date_formats: Dict[str, str]
+    http_timeout_seconds: int
+    http_pool_limit: int
+    http_pool_limit_per_host: int
+    http_keepalive_seconds: int
+    http_dns_cache_seconds: int
+    http_rate_limit_per_host: int
+    gzip_min_bytes: int
+    sse_buffer_size: int
+    sse_keepalive_seconds: int
+    http_retry_attempts: int
+    http_retry_base_delay_ms: int
+    http_retry_max_delay_seconds: float
+    circuit_breaker_threshold: int
+    circuit_breaker_reset_seconds: float
 
 
 @lru_cache
 def get_settings() -> Settings:
+    log_path = Path(os.getenv("LOG_PATH", "/data/mealie_bring_sync.log"))
+    default_pair = ListPair(
+        name="default",
+        mealie_shopping_list_id=os.getenv("MEALIE_SHOPPING_LIST_ID", ""),
+        bring_list_uuid=os.getenv("BRING_LIST_UUID"),
+    )
     return Settings(
         mealie_base_url=os.getenv("MEALIE_BASE_URL", "http://localhost:9000"),
         mealie_api_token=os.getenv("MEALIE_API_TOKEN", ""),
@@ -43,9 +139,29 @@ def get_settings() -> Settings:
         bring_email=os.getenv("BRING_EMAIL", ""),
         bring_password=os.getenv("BRING_PASSWORD", ""),
         bring_list_uuid=os.getenv("BRING_LIST_UUID"),
+        list_pairs=_env_list_pairs("SYNC_LIST_PAIRS", default_pair),
+        bring_base_url=os.getenv("BRING_BASE_URL", "https://api.getbring.com"),
+        bring_auth_cache_path=_env_path("BRING_AUTH_CACHE_PATH", "/data/bring_auth.json"),
+        bring_token_refresh_margin_seconds=_env_int("BRING_TOKEN_REFRESH_MARGIN_SECONDS", 300),
+        bring_batch_size=_env_int("BRING_BATCH_SIZE", 50),
         sync_interval_minutes=_env_int("SYNC_INTERVAL_MINUTES", 3),
-        log_path=Path(os.getenv("LOG_PATH", "/data/mealie_bring_sync.log")),
+        sync_max_interval_minutes=_env_int("SYNC_MAX_INTERVAL_MINUTES", 30),
+        sync_backoff_factor=_env_float("SYNC_BACKOFF_FACTOR", 2.0),
+        sync_jitter_percent=_env_int("SYNC_JITTER_PERCENT", 10),
+        sync_concurrency=_env_int("SYNC_CONCURRENCY", 4),
+        webhook_token=os.getenv("WEBHOOK_TOKEN", ""),
+        webhook_debounce_seconds=_env_int("WEBHOOK_DEBOUNCE_SECONDS", 5),
+        webhook_max_delay_seconds=_env_int("WEBHOOK_MAX_DELAY_SECONDS", 30),
+        mealie_mark_done_batch_size=_env_int("MEALIE_MARK_DONE_BATCH_SIZE", 25),
+        log_path=log_path,
+        log_store_path=Path(os.getenv("LOG_STORE_PATH") or log_path.with_suffix(".sqlite3")),
         log_retention_days=_env_int("LOG_RETENTION_DAYS", 30),
+        log_flush_batch_size=_env_int("LOG_FLUSH_BATCH_SIZE", 200),
+        log_flush_interval_ms=_env_int("LOG_FLUSH_INTERVAL_MS", 500),
+        log_page_size=_env_int("LOG_PAGE_SIZE", 100),
+        log_cache_size=_env_int("LOG_CACHE_SIZE", 1000),
+        trace_dashboard_runs=_env_int("TRACE_DASHBOARD_RUNS", 10),
+        ledger_path=_env_path("LEDGER_PATH", "/data/mealie_bring_ledger.sqlite3"),
         port=_env_int("PORT", 1235),
         dashboard_logo_url=os.getenv("DASHBOARD_LOGO_URL"),
         ui_locale=os.getenv("UI_LOCALE"),
@@ -55,4 +171,18 @@ def get_settings() -> Settings:
             "de": os.getenv("DATE_FORMAT_DE", "%d.%m.%Y %H:%M"),
             "en": os.getenv("DATE_FORMAT_EN", "%Y-%m-%d %H:%M"),
         },
+        http_timeout_seconds=_env_int("HTTP_TIMEOUT_SECONDS", 10),
+        http_pool_limit=_env_int("HTTP_POOL_LIMIT", 20),
+        http_pool_limit_per_host=_env_int("HTTP_POOL_LIMIT_PER_HOST", 8),
+        http_keepalive_seconds=_env_int("HTTP_KEEPALIVE_SECONDS", 60),
+        http_dns_cache_seconds=_env_int("HTTP_DNS_CACHE_SECONDS", 300),
+        http_rate_limit_per_host=_env_int("HTTP_RATE_LIMIT_PER_HOST", 10),
+        gzip_min_bytes=_env_int("GZIP_MIN_BYTES", 1024),
+        sse_buffer_size=_env_int("SSE_BUFFER_SIZE", 256),
+        sse_keepalive_seconds=_env_int("SSE_KEEPALIVE_SECONDS", 15),
+        http_retry_attempts=_env_int("HTTP_RETRY_ATTEMPTS", 3),
+        http_retry_base_delay_ms=_env_int("HTTP_RETRY_BASE_DELAY_MS", 500),
+        http_retry_max_delay_seconds=_env_float("HTTP_RETRY_MAX_DELAY_SECONDS", 30.0),
+        circuit_breaker_threshold=_env_int("CIRCUIT_BREAKER_THRESHOLD", 5),
+        circuit_breaker_reset_seconds=_env_float("CIRCUIT_BREAKER_RESET_SECONDS", 60.0),
     )
@@ -1,18 +1,32 @@
 import asyncio
+import base64
+import hashlib
+import heapq
 import json
 import logging
-from dataclasses import dataclass
+import threading
+import time
+from collections import deque
+from contextlib import contextmanager
+from contextvars import ContextVar
+from dataclasses import asdict, dataclass, field, replace
 from datetime import datetime, timedelta, timezone
-from pathlib import Path
-from typing import Any, Dict, List, Optional, Tuple
+from typing import Any, AsyncIterator, Awaitable, Callable, Deque, Dict, Iterator, List, Optional, Sequence, Tuple
+from uuid import uuid4
 
-import aiohttp
-
-from .settings import Settings, get_settings
+from .events import get_event_bus
+from .http_client import get_http_client
+from . import metrics, tracing
+from .ledger import LedgerKey, content_hash, get_ledger
+from .log_store import entry_ts, epoch_ms, get_log_store, get_log_writer
+from .resilience import ServiceUnavailableError
+from .settings import ListPair, Settings, get_settings
 
 logger = logging.getLogger("mealie2bring")
 
-SYNC_LOCK = asyncio.Lock()
+_PAIR_LOCKS: Dict[str, asyncio.Lock] = {}
+_CURRENT_PAIR: ContextVar[Optional[str]] = ContextVar("mealie2bring_pair", default=None)
+_CURRENT_RUN: ContextVar[Optional["_SyncRun"]] = ContextVar("mealie2bring_run", default=None)
 
 
 @dataclass
@@ -20,6 +34,8 @@ class BringAuth:
     token: str
     user_uuid: str
     list_uuid: str
+    refresh_token: Optional[str] = None
+    expires_at: Optional[float] = None
 
 
 def _now() -> datetime:
@@ -45,73 +61,287 @@ def _build_note(quantity: Optional[float], unit: Optional[str]) -> str:
     return " ".join(parts).strip()
 
 
-def _log_entry_path(settings: Settings) -> Path:
-    path = Path(settings.log_path)
-    path.parent.mkdir(parents=True, exist_ok=True)
-    return path
+def _log_cutoff(settings: Settings) -> datetime:
+    return _now() - timedelta(days=settings.log_retention_days)
 
 
-def _append_log_entry(settings: Settings, entry: Dict[str, Any]) -> None:
-    path = _log_entry_path(settings)
-    with path.open("a", encoding="utf-8") as handle:
-        handle.write(json.dumps(entry, ensure_ascii=False) + "\n")
+LogRow = Tuple[int, Dict[str, Any]]
 
+_LOG_CACHE_PARTITIONS = ("item", "event")
 
-def _prune_log_entries(settings: Settings) -> List[Dict[str, Any]]:
-    path = Path(settings.log_path)
-    if not path.exists():
-        return []
 
-    cutoff = _now() - timedelta(days=settings.log_retention_days)
-    retained: List[Dict[str, Any]] = []
-    for line in path.read_text(encoding="utf-8").splitlines():
-        if not line.strip():
-            continue
-        try:
-            entry = json.loads(line)
-        except json.JSONDecodeError:
-            continue
-        timestamp = entry.get("timestamp")
-        if not timestamp:
-            continue
-        try:
-            parsed = datetime.fromisoformat(timestamp)
-        except ValueError:
-            continue
-        if parsed.tzinfo is None:
-            parsed = parsed.replace(tzinfo=timezone.utc)
-        if parsed >= cutoff:
-            retained.append(entry)
+def _log_row_key(row: LogRow) -> Tuple[int, int]:
+    return row[1].get("ts", 0), row[0]
+
+
+def _log_partition(entry: Dict[str, Any]) -> str:
+    return "item" if entry.get("type") == "item" else "event"
+
+
+class _LogCachePartition:
+    def __init__(self) -> None:
+        self.rows: Deque[LogRow] = deque()
+        self.complete = False
+
+    def trim(self, max_size: int, cutoff: int) -> None:
+        while len(self.rows) > max_size:
+            self.rows.pop()
+            self.complete = False
+        while self.rows and self.rows[-1][1].get("ts", 0) < cutoff:
+            self.rows.pop()
+
+    def covers(self, since: int) -> bool:
+        return self.complete or bool(self.rows and self.rows[-1][1].get("ts", 0) < since)
+
+
+class LogCache:
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._partitions = {key: _LogCachePartition() for key in _LOG_CACHE_PARTITIONS}
+        self._loaded = False
+
+    def add(self, settings: Settings, row_id: int, entry: Dict[str, Any]) -> None:
+        if settings.log_cache_size <= 0:
+            return
+        with self._lock:
+            partition = self._partitions[_log_partition(entry)]
+            partition.rows.appendleft((row_id, entry))
+            partition.trim(settings.log_cache_size, 0)
+
+    def evict_before(self, cutoff: datetime) -> None:
+        with self._lock:
+            for partition in self._partitions.values():
+                partition.trim(len(partition.rows), epoch_ms(cutoff))
+
+    def _ensure_loaded(self, settings: Settings) -> None:
+        if self._loaded:
+            return
+        size = settings.log_cache_size
+        store = get_log_store(settings)
+        cutoff = _log_cutoff(settings)
+        loaded = {key: store.query(cutoff, types=[key], limit=size + 1) for key in _LOG_CACHE_PARTITIONS}
+        with self._lock:
+            if self._loaded:
+                return
+            for key, rows in loaded.items():
+                partition = self._partitions[key]
+                known = {row_id for row_id, _ in partition.rows}
+                merged = sorted(
+                    [*partition.rows, *(row for row in rows if row[0] not in known)],
+                    key=_log_row_key,
+                    reverse=True,
+                )
+                partition.rows = deque(merged)
+                partition.complete = len(rows) <= size
+                partition.trim(size, epoch_ms(cutoff))
+            self._loaded = True
+
+    def query(
+        self,
+        settings: Settings,
+        since: datetime,
+        until: Optional[datetime],
+        types: Sequence[str],
+        statuses: Sequence[str],
+        message_keys: Sequence[str],
+        before: Optional[Tuple[int, int]],
+        limit: int,
+    ) -> Optional[List[LogRow]]:
+        if settings.log_cache_size <= 0:
+            return None
+        self._ensure_loaded(settings)
+        since_value = epoch_ms(since)
+        until_value = epoch_ms(until) if until is not None else None
+        cutoff = epoch_ms(_log_cutoff(settings))
+        matches: List[List[LogRow]] = []
+        with self._lock:
+            for key, partition in self._partitions.items():
+                if types and not any(_log_partition({"type": value}) == key for value in types):
+                    continue
+                partition.trim(settings.log_cache_size, cutoff)
+                found: List[LogRow] = []
+                for row in partition.rows:
+                    row_id, entry = row
+                    ts = entry.get("ts", 0)
+                    if ts < since_value or len(found) >= limit:
+                        break
+                    if until_value is not None and ts >= until_value:
+                        continue
+                    if before is not None and (ts, row_id) >= before:
+                        continue
+                    if types and entry.get("type") not in types:
+                        continue
+                    if statuses and entry.get("status") not in statuses:
+                        continue
+                    if message_keys and entry.get("message_key") not in message_keys:
+                        continue
+                    if entry.get("type") == "item" and entry.get("status") == "skipped":
+                        continue
+                    found.append(row)
+                if len(found) < limit and not partition.covers(since_value):
+                    return None
+                matches.append(found)
+        return list(heapq.merge(*matches, key=_log_row_key, reverse=True))[:limit]
+
+
+LOG_CACHE = LogCache()
+
+
+class TraceCache:
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._traces: List[Dict[str, Any]] = []
+        self._loaded = False
+
+    def add(self, settings: Settings, trace: Dict[str, Any]) -> None:
+        with self._lock:
+            traces = sorted([trace, *self._traces], key=lambda item: item.get("ts", 0), reverse=True)
+            self._traces = traces[:max(0, settings.trace_dashboard_runs)]
+
+    def evict_before(self, cutoff: datetime) -> None:
+        cutoff_value = epoch_ms(cutoff)
+        with self._lock:
+            self._traces = [trace for trace in self._traces if trace.get("ts", 0) >= cutoff_value]
+
+    def recent(self, settings: Settings, limit: int, pair_name: Optional[str]) -> Optional[List[Dict[str, Any]]]:
+        if pair_name is not None or limit > settings.trace_dashboard_runs:
+            return None
+        if not self._loaded:
+            loaded = get_log_store(settings).recent_traces(settings.trace_dashboard_runs)
+            with self._lock:
+                if not self._loaded:
+                    known = {trace["id"] for trace in self._traces}
+                    self._traces = sorted(
+                        [*self._traces, *(trace for trace in loaded if trace["id"] not in known)],
+                        key=lambda item: item.get("ts", 0),
+                        reverse=True,
+                    )[:settings.trace_dashboard_runs]
+                    self._loaded = True
+        with self._lock:
+            return self._traces[:limit]
+
 
-    path.write_text("\n".join(json.dumps(entry, ensure_ascii=False) for entry in retained) + ("\n" if retained else ""), encoding="utf-8")
-    return retained
+TRACE_CACHE = TraceCache()
+
+
+class LogVersion:
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._boot = uuid4().hex[:8]
+        self._value = 0
+        self._changed_at = _now()
+
+    def bump(self) -> None:
+        with self._lock:
+            self._value += 1
+            self._changed_at = _now()
+
+    def current(self) -> Tuple[str, datetime]:
+        with self._lock:
+            return f"{self._boot}-{self._value}", self._changed_at
+
+
+LOG_VERSION = LogVersion()
+
+
+def _append_log_entry(settings: Settings, entry: Dict[str, Any]) -> None:
+    row_id = get_log_writer(settings).submit(entry)
+    LOG_CACHE.add(settings, row_id, entry)
+    LOG_VERSION.bump()
+    get_event_bus(settings).publish({"type": "log", "id": row_id, "entry": entry})
+
+
+def _prune_log_entries(settings: Settings) -> int:
+    cutoff = _log_cutoff(settings)
+    LOG_CACHE.evict_before(cutoff)
+    TRACE_CACHE.evict_before(cutoff)
+    deleted = get_log_store(settings).prune(cutoff)
+    if deleted:
+        LOG_VERSION.bump()
+    return deleted
 
 
 def load_log_entries(settings: Settings) -> List[Dict[str, Any]]:
-    entries = _prune_log_entries(settings)
-    filtered = [
-        entry
-        for entry in entries
-        if not (entry.get("type") == "item" and entry.get("status") == "skipped")
-    ]
-    return sorted(filtered, key=lambda entry: entry.get("timestamp", ""), reverse=True)
+    return get_log_store(settings).entries_since(_log_cutoff(settings))
+
+
+def recent_traces(settings: Settings, limit: int, pair_name: Optional[str] = None) -> List[Dict[str, Any]]:
+    traces = TRACE_CACHE.recent(settings, limit, pair_name)
+    if traces is None:
+        traces = get_log_store(settings).recent_traces(limit, pair_name)
+    return traces
+
+
+def _encode_cursor(ts: int, row_id: int) -> str:
+    return base64.urlsafe_b64encode(f"{ts}|{row_id}".encode("utf-8")).decode("ascii")
+
+
+def _decode_cursor(cursor: str) -> Tuple[int, int]:
+    position, row_id = base64.urlsafe_b64decode(cursor.encode("ascii")).decode("utf-8").rsplit("|", 1)
+    ts = int(position) if position.isdigit() else entry_ts({"timestamp": position})
+    if ts is None:
+        raise ValueError("Invalid cursor")
+    return ts, int(row_id)
+
+
+def query_log_entries(
+    settings: Settings,
+    types: Sequence[str] = (),
+    statuses: Sequence[str] = (),
+    message_keys: Sequence[str] = (),
+    since: Optional[datetime] = None,
+    until: Optional[datetime] = None,
+    cursor: Optional[str] = None,
+    limit: int = 100,
+) -> Tuple[List[Dict[str, Any]], Optional[str]]:
+    cutoff = _log_cutoff(settings)
+    if since is None or since < cutoff:
+        since = cutoff
+    before = _decode_cursor(cursor) if cursor else None
+    rows = LOG_CACHE.query(settings, since, until, types, statuses, message_keys, before, limit + 1)
+    if rows is None:
+        rows = get_log_store(settings).query(
+            since,
+            until=until,
+            types=types,
+            statuses=statuses,
+            message_keys=message_keys,
+            before=before,
+            limit=limit + 1,
+        )
+    next_cursor = None
+    if len(rows) > limit:
+        rows = rows[:limit]
+        row_id, entry = rows[-1]
+        next_cursor = _encode_cursor(entry["ts"], row_id)
+    return [dict(entry) for _, entry in rows], next_cursor
 
 
 def _log_event(settings: Settings, level: str, message_key: str, context: Optional[Dict[str, Any]] = None) -> None:
+    now = _now()
     entry = {
-        "timestamp": _now().isoformat(),
+        "timestamp": now.isoformat(),
+        "ts": epoch_ms(now),
         "level": level,
         "type": "event",
         "message_key": message_key,
         "context": context or {},
     }
+    pair_name = _CURRENT_PAIR.get()
+    if pair_name is not None:
+        entry["pair"] = pair_name
+    run = _CURRENT_RUN.get()
+    if run is not None and level == "ERROR":
+        run.errors += 1
     _append_log_entry(settings, entry)
     logger.log(getattr(logging, level, logging.INFO), "%s | %s", message_key, context or {})
 
 
 def _log_item(settings: Settings, payload: Dict[str, Any]) -> None:
+    now = _now()
     entry = {
-        "timestamp": _now().isoformat(),
+        "timestamp": now.isoformat(),
+        "ts": epoch_ms(now),
         "type": "item",
         **payload,
     }
@@ -119,103 +349,258 @@ def _log_item(settings: Settings, payload: Dict[str, Any]) -> None:
     logger.info("%s | %s", payload.get("status"), {"name": payload.get("name"), "note": payload.get("note")})
 
 
-async def _fetch_mealie_list(settings: Settings) -> List[Dict[str, Any]]:
-    url = f"{settings.mealie_base_url.rstrip('/')}/api/households/shopping/lists/{settings.mealie_shopping_list_id}"
+@contextmanager
+def _phase(phase: str, **attributes: Any) -> Iterator[None]:
+    with metrics.phase_timer(phase), tracing.span(phase, **attributes):
+        yield
+
+
+async def _fetch_mealie_list(settings: Settings, pair: ListPair) -> List[Dict[str, Any]]:
+    url = f"{settings.mealie_base_url.rstrip('/')}/api/households/shopping/lists/{pair.mealie_shopping_list_id}"
     headers = {
         "Authorization": f"Bearer {settings.mealie_api_token}",
         "Accept": "application/json",
     }
-    timeout = aiohttp.ClientTimeout(total=10)
-    async with aiohttp.ClientSession(timeout=timeout) as session:
-        async with session.get(url, headers=headers) as response:
-            if response.status != 200:
-                body = await response.text()
-                _log_event(settings, "ERROR", "log.mealie_fetch_failed", {
-                    "status": response.status,
-                    "body": body,
-                })
-                return []
-            data = await response.json()
-            return data.get("listItems", [])
+    with _phase("mealie_fetch"):
+        response = await get_http_client(settings).request("GET", url, service="mealie", headers=headers)
+    if response.status != 200:
+        _log_event(settings, "ERROR", "log.mealie_fetch_failed", {
+            "status": response.status,
+            "body": response.text(),
+        })
+        return []
+    data = response.json() or {}
+    return data.get("listItems", [])
 
 
-async def _bring_login(settings: Settings) -> Optional[BringAuth]:
-    if not settings.bring_email or not settings.bring_password:
-        _log_event(settings, "ERROR", "log.bring_credentials_missing")
-        return None
+def _bring_url(settings: Settings, path: str) -> str:
+    return f"{settings.bring_base_url.rstrip('/')}/rest/v2/{path}"
 
-    url = "https://api.getbring.com/rest/v2/bringauth"
+
+def _bring_headers(auth: Optional[BringAuth] = None) -> Dict[str, str]:
     headers = {
-        "Content-Type": "application/x-www-form-urlencoded",
         "X-BRING-API-KEY": "webApp",
         "X-BRING-CLIENT": "webApp",
         "X-BRING-CLIENT-VERSION": "1.0.0",
         "User-Agent": "BringWebApp/1.0",
+        "Content-Type": "application/x-www-form-urlencoded",
     }
+    if auth is not None:
+        headers["Authorization"] = f"Bearer {auth.token}"
+        headers["X-BRING-USER-UUID"] = auth.user_uuid
+    return headers
+
+
+def _expires_at(data: Dict[str, Any]) -> Optional[float]:
+    try:
+        expires_in = float(data.get("expires_in"))
+    except (TypeError, ValueError):
+        return None
+    return _now().timestamp() + expires_in
+
+
+async def _bring_login(settings: Settings) -> Optional[BringAuth]:
+    if not settings.bring_email or not settings.bring_password:
+        _log_event(settings, "ERROR", "log.bring_credentials_missing")
+        return None
+
     payload = {
         "email": settings.bring_email,
         "password": settings.bring_password,
     }
-    timeout = aiohttp.ClientTimeout(total=10)
-    async with aiohttp.ClientSession(timeout=timeout) as session:
-        async with session.post(url, data=payload, headers=headers) as response:
-            if response.status != 200:
-                body = await response.text()
-                _log_event(settings, "ERROR", "log.bring_login_failed", {
-                    "status": response.status,
-                    "body": body,
-                })
-                return None
-            data = await response.json()
+    with _phase("bring_login"):
+        response = await get_http_client(settings).request(
+            "POST", _bring_url(settings, "bringauth"), service="bring", data=payload, headers=_bring_headers()
+        )
+    if response.status != 200:
+        _log_event(settings, "ERROR", "log.bring_login_failed", {
+            "status": response.status,
+            "body": response.text(),
+        })
+        return None
+    data = response.json() or {}
 
     token = data.get("access_token")
     user_uuid = data.get("uuid")
-    list_uuid = settings.bring_list_uuid or data.get("bringListUUID")
+    list_uuid = data.get("bringListUUID") or settings.bring_list_uuid
     if not token or not user_uuid or not list_uuid:
         _log_event(settings, "ERROR", "log.bring_login_incomplete", data)
         return None
 
-    return BringAuth(token=token, user_uuid=user_uuid, list_uuid=list_uuid)
+    return BringAuth(
+        token=token,
+        user_uuid=user_uuid,
+        list_uuid=list_uuid,
+        refresh_token=data.get("refresh_token"),
+        expires_at=_expires_at(data),
+    )
 
 
-async def _bring_add_item(auth: BringAuth, name: str, note: str) -> bool:
-    url = f"https://api.getbring.com/rest/v2/bringlists/{auth.list_uuid}"
-    headers = {
-        "Authorization": f"Bearer {auth.token}",
-        "X-BRING-USER-UUID": auth.user_uuid,
-        "X-BRING-API-KEY": "webApp",
-        "X-BRING-CLIENT": "webApp",
-        "X-BRING-CLIENT-VERSION": "1.0.0",
-        "User-Agent": "BringWebApp/1.0",
-        "Content-Type": "application/x-www-form-urlencoded",
+async def _bring_refresh(settings: Settings, auth: BringAuth) -> Optional[BringAuth]:
+    payload = {
+        "grant_type": "refresh_token",
+        "refresh_token": auth.refresh_token,
     }
+    with _phase("bring_refresh"):
+        response = await get_http_client(settings).request(
+            "POST", _bring_url(settings, "bringauth/token"), service="bring", data=payload, headers=_bring_headers()
+        )
+    if response.status != 200:
+        _log_event(settings, "WARN", "log.bring_refresh_failed", {"status": response.status})
+        return None
+    data = response.json() or {}
+    token = data.get("access_token")
+    if not token:
+        _log_event(settings, "WARN", "log.bring_refresh_failed", {"status": response.status})
+        return None
+    return BringAuth(
+        token=token,
+        user_uuid=auth.user_uuid,
+        list_uuid=auth.list_uuid,
+        refresh_token=data.get("refresh_token") or auth.refresh_token,
+        expires_at=_expires_at(data),
+    )
+
+
+class BringAuthCache:
+    def __init__(self) -> None:
+        self._auth: Optional[BringAuth] = None
+        self._email: Optional[str] = None
+        self._loaded = False
+        self._lock = asyncio.Lock()
+        self._failed_token: Optional[str] = None
+
+    def _load(self, settings: Settings) -> None:
+        if self._loaded:
+            return
+        self._loaded = True
+        path = settings.bring_auth_cache_path
+        if path is None or not path.exists():
+            return
+        try:
+            data = json.loads(path.read_text(encoding="utf-8"))
+            self._email = data.pop("email")
+            self._auth = BringAuth(**data)
+        except (OSError, ValueError, TypeError, KeyError):
+            logger.warning("Ignoring unreadable Bring auth cache at %s", path)
+            self._auth = None
+
+    def _persist(self, settings: Settings) -> None:
+        path = settings.bring_auth_cache_path
+        if path is None:
+            return
+        try:
+            if self._auth is None:
+                path.unlink(missing_ok=True)
+                return
+            path.parent.mkdir(parents=True, exist_ok=True)
+            path.write_text(json.dumps({"email": self._email, **asdict(self._auth)}), encoding="utf-8")
+            path.chmod(0o600)
+        except OSError:
+            logger.warning("Could not write Bring auth cache to %s", path)
+
+    def _store(self, settings: Settings, auth: Optional[BringAuth]) -> None:
+        if auth is not None:
+            self._failed_token = None
+        self._auth = auth
+        self._email = settings.bring_email if auth else None
+        self._persist(settings)
+
+    def _is_fresh(self, settings: Settings, auth: BringAuth) -> bool:
+        if auth.expires_at is None:
+            return True
+        return auth.expires_at - settings.bring_token_refresh_margin_seconds > _now().timestamp()
+
+    def _resolve(self, settings: Settings, auth: Optional[BringAuth]) -> Optional[BringAuth]:
+        if auth is None or not settings.bring_list_uuid:
+            return auth
+        return replace(auth, list_uuid=settings.bring_list_uuid)
+
+    async def get(self, settings: Settings) -> Optional[BringAuth]:
+        async with self._lock:
+            self._load(settings)
+            auth = self._auth if self._email == settings.bring_email else None
+            if auth is not None and self._is_fresh(settings, auth):
+                return self._resolve(settings, auth)
+            if auth is not None and auth.refresh_token:
+                refreshed = await _bring_refresh(settings, auth)
+                if refreshed is not None:
+                    self._store(settings, refreshed)
+                    return self._resolve(settings, refreshed)
+            auth = await _bring_login(settings)
+            self._store(settings, auth)
+            return self._resolve(settings, auth)
+
+    async def renew_after_unauthorized(self, settings: Settings, rejected: BringAuth) -> Optional[BringAuth]:
+        async with self._lock:
+            if self._auth is not None and self._auth.token != rejected.token:
+                return self._resolve(settings, self._auth)
+            if self._failed_token == rejected.token:
+                return None
+            auth = await _bring_login(settings)
+            self._store(settings, auth)
+            if auth is None:
+                self._failed_token = rejected.token
+            return self._resolve(settings, auth)
+
+
+BRING_AUTH_CACHE = BringAuthCache()
+
+
+async def _bring_add_item(settings: Settings, auth: BringAuth, name: str, note: str) -> int:
     payload = {
         "purchase": name,
         "recently": "",
         "specification": note,
     }
+    with _phase("bring_add", item=name):
+        response = await get_http_client(settings).request(
+            "PUT",
+            _bring_url(settings, f"bringlists/{auth.list_uuid}"),
+            service="bring",
+            data=payload,
+            headers=_bring_headers(auth),
+        )
+    return response.status
+
 
-    timeout = aiohttp.ClientTimeout(total=10)
-    async with aiohttp.ClientSession(timeout=timeout) as session:
-        async with session.put(url, data=payload, headers=headers) as response:
-            return response.status in {200, 204}
+async def _bring_add_items(settings: Settings, auth: BringAuth, entries: List[Tuple[str, str]]) -> int:
+    payload = {
+        "changes": [
+            {
+                "itemId": name,
+                "spec": note,
+                "uuid": str(uuid4()),
+                "operation": "TO_PURCHASE",
+            }
+            for name, note in entries
+        ],
+        "sender": "",
+    }
+    headers = {**_bring_headers(auth), "Content-Type": "application/json"}
+    with _phase("bring_add_batch", items=len(entries)):
+        response = await get_http_client(settings).request(
+            "PUT",
+            _bring_url(settings, f"bringlists/{auth.list_uuid}/items"),
+            service="bring",
+            data=json.dumps(payload),
+            headers=headers,
+        )
+    return response.status
 
 
-async def _mealie_mark_done(settings: Settings, item: Dict[str, Any]) -> bool:
+async def _mealie_mark_done(settings: Settings, items: List[Dict[str, Any]]) -> bool:
     url = f"{settings.mealie_base_url.rstrip('/')}/api/households/shopping/items"
     headers = {
         "Authorization": f"Bearer {settings.mealie_api_token}",
         "Content-Type": "application/json",
         "Accept": "application/json",
     }
-    payload_item = dict(item)
-    payload_item["checked"] = True
-    payload = json.dumps([payload_item])
+    payload = json.dumps([{**item, "checked": True} for item in items])
 
-    timeout = aiohttp.ClientTimeout(total=10)
-    async with aiohttp.ClientSession(timeout=timeout) as session:
-        async with session.put(url, data=payload, headers=headers) as response:
-            return response.status == 200
+    with _phase("mealie_mark_done", items=len(items)):
+        response = await get_http_client(settings).request("PUT", url, service="mealie", data=payload, headers=headers)
+    return response.status == 200
 
 
 def _extract_item_details(item: Dict[str, Any]) -> Tuple[Optional[str], str, Optional[str], str, Optional[str]]:
@@ -236,80 +621,572 @@ def _extract_item_details(item: Dict[str, Any]) -> Tuple[Optional[str], str, Opt
     return name, note, item_id, quantity, unit
 
 
-async def sync_mealie_to_bring(trigger: str = "scheduler") -> List[Dict[str, Any]]:
-    settings = get_settings()
-    async with SYNC_LOCK:
-        _prune_log_entries(settings)
-        _log_event(settings, "INFO", "log.sync_started", {"trigger": trigger})
+@dataclass
+class _Transfer:
+    item: Dict[str, Any]
+    name: Optional[str]
+    note: str
+    item_id: Optional[str]
+    quantity: str
+    unit: Optional[str]
+    ok: bool = False
+    bring_state: str = "-"
+    mealie_state: str = "-"
+    failure: Optional[str] = None
 
-        if not settings.mealie_api_token or not settings.mealie_shopping_list_id:
-            _log_event(settings, "ERROR", "log.mealie_config_missing")
-            return []
+    @property
+    def ledger_key(self) -> Optional[LedgerKey]:
+        if not self.item_id:
+            return None
+        return self.item_id, content_hash(self.name, self.quantity, self.unit)
 
-        items = await _fetch_mealie_list(settings)
-        if not items:
-            _log_event(settings, "INFO", "log.mealie_no_items")
-            return []
 
-        open_items = [item for item in items if not item.get("checked")]
-        if not open_items:
-            _log_event(settings, "INFO", "log.mealie_no_open_items")
-            return []
+def _normalize_name(value: Optional[str]) -> str:
+    return " ".join((value or "").split()).casefold()
+
+
+def _merge_key(transfer: _Transfer) -> Tuple[str, str]:
+    return _normalize_name(transfer.name), _normalize_name(transfer.unit)
+
+
+def _quantity_value(transfer: _Transfer) -> Optional[float]:
+    value = transfer.item.get("quantity")
+    if value is None:
+        return 0.0
+    try:
+        return float(value)
+    except (TypeError, ValueError):
+        return None
+
+
+def _group_duplicates(transfers: List[_Transfer]) -> List[List[_Transfer]]:
+    groups: Dict[Tuple[str, str], List[_Transfer]] = {}
+    singles: List[List[_Transfer]] = []
+    for transfer in transfers:
+        if _quantity_value(transfer) is None:
+            singles.append([transfer])
+        else:
+            groups.setdefault(_merge_key(transfer), []).append(transfer)
+    return [*groups.values(), *singles]
+
+
+def _merged_transfer(settings: Settings, group: List[_Transfer]) -> _Transfer:
+    first = group[0]
+    if len(group) == 1:
+        return first
+    total = round(sum(_quantity_value(transfer) or 0.0 for transfer in group), 3)
+    merged = replace(
+        first,
+        note=_build_note(total, first.unit),
+        quantity=_format_quantity(total),
+        ok=False,
+        bring_state="-",
+        failure=None,
+    )
+    _log_event(settings, "INFO", "log.bring_items_merged", {
+        "name": first.name,
+        "count": len(group),
+        "note": merged.note,
+    })
+    return merged
+
+
+async def _bring_list_index(settings: Settings, auth: BringAuth) -> Dict[str, str]:
+    index: Dict[str, str] = {}
+
+    async def fetch(current: BringAuth) -> int:
+        with _phase("bring_fetch"):
+            response = await get_http_client(settings).request(
+                "GET",
+                _bring_url(settings, f"bringlists/{current.list_uuid}"),
+                service="bring",
+                headers=_bring_headers(current),
+            )
+        if response.status == 200:
+            data = response.json() or {}
+            for entry in data.get("purchase") or []:
+                index[_normalize_name(entry.get("name"))] = " ".join((entry.get("specification") or "").split())
+        return response.status
+
+    try:
+        status = await _bring_call(settings, auth, fetch)
+    except ServiceUnavailableError:
+        return {}
+    if status != 200:
+        _log_event(settings, "WARN", "log.bring_fetch_failed", {"status": status})
+    return index
+
+
+async def _bring_transfer_groups(
+    settings: Settings,
+    auth: BringAuth,
+    transfers: List[_Transfer],
+    semaphore: asyncio.Semaphore,
+) -> None:
+    groups = _group_duplicates(transfers)
+    sends = [_merged_transfer(settings, group) for group in groups]
+    index = await _bring_list_index(settings, auth)
+    changed = []
+    for sent in sends:
+        if index.get(_normalize_name(sent.name)) == " ".join(sent.note.split()):
+            sent.ok = True
+            sent.bring_state = "unchanged"
+        else:
+            changed.append(sent)
+    _start_stage("bring", len(changed))
+    await _bring_transfer_all(settings, auth, changed, semaphore)
+    for group, sent in zip(groups, sends):
+        for transfer in group:
+            transfer.ok = sent.ok
+            transfer.bring_state = sent.bring_state
+            transfer.failure = sent.failure
+            if transfer.ok and not transfer.item_id:
+                transfer.mealie_state = "skipped"
+
+
+async def _bring_call(
+    settings: Settings,
+    auth: BringAuth,
+    call: Callable[[BringAuth], Awaitable[int]],
+) -> int:
+    run = _CURRENT_RUN.get()
+    if run is not None and run.bring_unauthorized:
+        return 401
+    status = await call(auth)
+    if status == 401:
+        renewed = await BRING_AUTH_CACHE.renew_after_unauthorized(settings, auth)
+        if renewed is not None:
+            status = await call(replace(renewed, list_uuid=auth.list_uuid))
+        elif run is not None:
+            run.bring_unauthorized = True
+    return status
+
+
+def _start_stage(stage: str, total: int) -> None:
+    run = _CURRENT_RUN.get()
+    if run is not None:
+        run.totals[stage] = total
+        run.done[stage] = 0
+
+
+def _report_progress(settings: Settings, stage: str, transfers: List[_Transfer]) -> None:
+    run = _CURRENT_RUN.get()
+    if run is None:
+        return
+    run.done[stage] = run.done.get(stage, 0) + len(transfers)
+    get_event_bus(settings).publish({
+        "type": "progress",
+        "pair": _CURRENT_PAIR.get(),
+        "stage": stage,
+        "done": run.done[stage],
+        "total": run.totals.get(stage, run.done[stage]),
+        "items": [
+            {
+                "name": transfer.name,
+                "ok": transfer.ok if stage == "bring" else transfer.mealie_state == "done",
+            }
+            for transfer in transfers
+        ],
+    })
+
+
+async def _bring_transfer_item(
+    settings: Settings,
+    auth: BringAuth,
+    transfer: _Transfer,
+    semaphore: asyncio.Semaphore,
+) -> None:
+    try:
+        async with semaphore:
+            status = await _bring_call(
+                settings, auth, lambda current: _bring_add_item(settings, current, transfer.name, transfer.note)
+            )
+    except ServiceUnavailableError:
+        transfer.ok = False
+        transfer.failure = "bring_unavailable"
+        _report_progress(settings, "bring", [transfer])
+        return
+    transfer.ok = status in {200, 204}
+    if transfer.ok:
+        transfer.bring_state = "sent"
+        transfer.failure = None
+    else:
+        transfer.failure = "bring_rejected"
+    _report_progress(settings, "bring", [transfer])
+
+
+async def _bring_transfer_batch(
+    settings: Settings,
+    auth: BringAuth,
+    batch: List[_Transfer],
+    semaphore: asyncio.Semaphore,
+) -> None:
+    entries = [(transfer.name, transfer.note) for transfer in batch]
+    try:
+        async with semaphore:
+            status = await _bring_call(settings, auth, lambda current: _bring_add_items(settings, current, entries))
+    except ServiceUnavailableError:
+        for transfer in batch:
+            transfer.ok = False
+            transfer.failure = "bring_unavailable"
+        _report_progress(settings, "bring", batch)
+        return
+    if status in {200, 204}:
+        for transfer in batch:
+            transfer.ok = True
+            transfer.bring_state = "sent"
+        _report_progress(settings, "bring", batch)
+        return
+    if status in {401, 403}:
+        for transfer in batch:
+            transfer.ok = False
+            transfer.failure = "bring_rejected"
+        _report_progress(settings, "bring", batch)
+        return
+    logger.warning("Bring batch update failed with status %s, falling back to single updates", status)
+    await asyncio.gather(*(
+        _bring_transfer_item(settings, auth, transfer, semaphore)
+        for transfer in batch
+    ))
+
+
+async def _bring_transfer_all(
+    settings: Settings,
+    auth: BringAuth,
+    transfers: List[_Transfer],
+    semaphore: asyncio.Semaphore,
+) -> None:
+    size = settings.bring_batch_size
+    if size > 0:
+        await asyncio.gather(*(
+            _bring_transfer_batch(settings, auth, transfers[start:start + size], semaphore)
+            for start in range(0, len(transfers), size)
+        ))
+    else:
+        await asyncio.gather(*(
+            _bring_transfer_item(settings, auth, transfer, semaphore)
+            for transfer in transfers
+        ))
+    for transfer in transfers:
+        if transfer.ok and not transfer.item_id:
+            transfer.mealie_state = "skipped"
+
+
+async def _mark_done_chunk(settings: Settings, chunk: List[_Transfer], semaphore: asyncio.Semaphore) -> None:
+    try:
+        async with semaphore:
+            done = await _mealie_mark_done(settings, [transfer.item for transfer in chunk])
+    except ServiceUnavailableError:
+        for transfer in chunk:
+            transfer.mealie_state = "open"
+            transfer.failure = "mealie_unavailable"
+        _report_progress(settings, "mealie", chunk)
+        _emit_results(chunk)
+        return
+    if done or len(chunk) == 1:
+        for transfer in chunk:
+            transfer.mealie_state = "done" if done else "open"
+            if not done:
+                transfer.failure = "mealie_rejected"
+        _report_progress(settings, "mealie", chunk)
+        _emit_results(chunk)
+        return
+    middle = len(chunk) // 2
+    await asyncio.gather(
+        _mark_done_chunk(settings, chunk[:middle], semaphore),
+        _mark_done_chunk(settings, chunk[middle:], semaphore),
+    )
+
+
+async def _mark_done_in_chunks(settings: Settings, transfers: List[_Transfer], semaphore: asyncio.Semaphore) -> None:
+    size = max(1, settings.mealie_mark_done_batch_size)
+    await asyncio.gather(*(
+        _mark_done_chunk(settings, transfers[start:start + size], semaphore)
+        for start in range(0, len(transfers), size)
+    ))
+
+
+def _transfer_payload(transfer: _Transfer) -> Dict[str, Any]:
+    payload = {
+        "status": "ok" if transfer.ok else "error",
+        "name": transfer.name,
+        "note": transfer.note,
+        "quantity": transfer.quantity,
+        "unit": transfer.unit,
+        "bring": transfer.bring_state,
+        "mealie": transfer.mealie_state,
+        "itemId": transfer.item_id,
+    }
+    pair_name = _CURRENT_PAIR.get()
+    if pair_name is not None:
+        payload["pair"] = pair_name
+    return payload
+
+
+def _emit_results(transfers: List[_Transfer]) -> None:
+    run = _CURRENT_RUN.get()
+    if run is None or run.on_result is None:
+        return
+    for transfer in transfers:
+        if transfer.name:
+            run.on_result(_transfer_payload(transfer))
+
 
-        auth = await _bring_login(settings)
+def _log_transfer(settings: Settings, transfer: _Transfer) -> Optional[Dict[str, Any]]:
+    item_id = transfer.item_id
+    name = transfer.name
+    if not name:
+        _log_event(settings, "WARN", "log.item_missing_name", {"itemId": item_id})
+        metrics.record_item(_CURRENT_PAIR.get() or "", "missing_name")
+        return None
+
+    if transfer.mealie_state == "done":
+        _log_event(settings, "INFO", "log.mealie_mark_done", {
+            "itemId": item_id,
+            "name": name,
+        })
+    elif transfer.mealie_state == "open":
+        _log_event(settings, "WARN", "log.mealie_mark_failed", {
+            "itemId": item_id,
+            "name": name,
+        })
+
+    if transfer.bring_state == "ledger":
+        _log_event(settings, "INFO", "log.bring_item_already_transferred", {
+            "itemId": item_id,
+            "name": name,
+        })
+    elif transfer.bring_state == "unchanged":
+        _log_event(settings, "INFO", "log.bring_item_unchanged", {
+            "itemId": item_id,
+            "name": name,
+            "note": transfer.note,
+        })
+    elif transfer.ok:
+        _log_event(settings, "INFO", "log.bring_item_transferred", {
+            "itemId": item_id,
+            "name": name,
+            "note": transfer.note,
+        })
+    else:
+        _log_event(settings, "ERROR", "log.bring_item_failed", {
+            "itemId": item_id,
+            "name": name,
+        })
+
+    payload = _transfer_payload(transfer)
+    pair_name = _CURRENT_PAIR.get()
+    if transfer.failure is not None or transfer.bring_state in {"sent", "unchanged"}:
+        metrics.record_item(pair_name or "", transfer.failure)
+    _log_item(settings, payload)
+    return payload
+
+
+@dataclass(frozen=True)
+class ListSnapshot:
+    open_items: int
+    signature: str
+    taken_at: datetime
+
+
+_LIST_SNAPSHOTS: Dict[str, ListSnapshot] = {}
+
+
+def _list_signature(items: List[Dict[str, Any]]) -> str:
+    ordered = sorted(items, key=lambda item: str(item.get("id")))
+    raw = json.dumps(ordered, sort_keys=True, default=str)
+    return hashlib.sha1(raw.encode("utf-8")).hexdigest()
+
+
+def get_list_snapshot(pair_name: str) -> Optional[ListSnapshot]:
+    return _LIST_SNAPSHOTS.get(pair_name)
+
+
+def _pair_lock(pair: ListPair) -> asyncio.Lock:
+    if pair.name not in _PAIR_LOCKS:
+        _PAIR_LOCKS[pair.name] = asyncio.Lock()
+    return _PAIR_LOCKS[pair.name]
+
+
+def _log_service_unavailable(settings: Settings, service: str) -> None:
+    _log_event(settings, "ERROR", "log.service_unavailable", {"service": service.capitalize()})
+
+
+@dataclass
+class _SyncRun:
+    errors: int = 0
+    totals: Dict[str, int] = field(default_factory=dict)
+    done: Dict[str, int] = field(default_factory=dict)
+    on_result: Optional[Callable[[Dict[str, Any]], None]] = None
+    bring_unauthorized: bool = False
+
+
+async def _sync_pair(
+    settings: Settings,
+    pair: ListPair,
+    trigger: str,
+    on_result: Optional[Callable[[Dict[str, Any]], None]] = None,
+) -> List[Dict[str, Any]]:
+    _CURRENT_PAIR.set(pair.name)
+    async with _pair_lock(pair):
+        run = _SyncRun(on_result=on_result)
+        _CURRENT_RUN.set(run)
+        trace = tracing.start_trace(pair.name, trigger)
+        started = time.perf_counter()
+        results: List[Dict[str, Any]] = []
+        try:
+            results = await _run_pair(settings, pair, trigger)
+            return results
+        finally:
+            metrics.record_sync(pair.name, time.perf_counter() - started, run.errors == 0)
+            trace.finish(errors=run.errors)
+            tracing.end_trace()
+            _CURRENT_RUN.set(None)
+            get_event_bus(settings).publish({
+                "type": "sync_finished",
+                "pair": pair.name,
+                "trigger": trigger,
+                "errors": run.errors,
+                "duration_ms": trace.duration_ms,
+                "items": len(results),
+            })
+            try:
+                stored = trace.to_dict()
+                await asyncio.to_thread(get_log_store(settings).append_trace, stored)
+                TRACE_CACHE.add(settings, stored)
+                LOG_VERSION.bump()
+            except Exception:
+                logger.exception("Could not store trace for %s", pair.name)
+
+
+async def _run_pair(settings: Settings, pair: ListPair, trigger: str) -> List[Dict[str, Any]]:
+    with tracing.span("log_prune"):
+        await asyncio.to_thread(_prune_log_entries, settings)
+        ledger = get_ledger(settings)
+        if ledger is not None:
+            await asyncio.to_thread(ledger.prune, timedelta(days=settings.log_retention_days).total_seconds())
+    _log_event(settings, "INFO", "log.sync_started", {"trigger": trigger})
+
+    if not settings.mealie_api_token or not pair.mealie_shopping_list_id:
+        _log_event(settings, "ERROR", "log.mealie_config_missing")
+        return []
+
+    try:
+        items = await _fetch_mealie_list(settings, pair)
+    except ServiceUnavailableError as error:
+        _log_service_unavailable(settings, error.service)
+        return []
+    _LIST_SNAPSHOTS[pair.name] = ListSnapshot(
+        open_items=sum(1 for item in items if not item.get("checked")),
+        signature=_list_signature(items),
+        taken_at=_now(),
+    )
+    metrics.record_open_items(pair.name, _LIST_SNAPSHOTS[pair.name].open_items)
+    if not items:
+        _log_event(settings, "INFO", "log.mealie_no_items")
+        return []
+
+    open_items = [item for item in items if not item.get("checked")]
+    if not open_items:
+        _log_event(settings, "INFO", "log.mealie_no_open_items")
+        return []
+
+    transfers = [_Transfer(item, *_extract_item_details(item)) for item in open_items]
+    named = [transfer for transfer in transfers if transfer.name]
+    if ledger is not None:
+        already = await asyncio.to_thread(
+            ledger.transferred, [transfer.ledger_key for transfer in named if transfer.ledger_key]
+        )
+        for transfer in named:
+            if transfer.ledger_key in already:
+                transfer.ok = True
+                transfer.bring_state = "ledger"
+
+    pending = [
+        transfer
+        for group in _group_duplicates(named)
+        if any(not member.ok for member in group)
+        for transfer in group
+    ]
+    semaphore = asyncio.Semaphore(max(1, settings.sync_concurrency))
+    if pending:
+        try:
+            auth = await BRING_AUTH_CACHE.get(settings)
+        except ServiceUnavailableError as error:
+            _log_service_unavailable(settings, error.service)
+            return []
         if not auth:
             return []
+        if pair.bring_list_uuid:
+            auth = replace(auth, list_uuid=pair.bring_list_uuid)
+        await _bring_transfer_groups(settings, auth, pending, semaphore)
+        if ledger is not None:
+            await asyncio.to_thread(
+                ledger.record, [transfer.ledger_key for transfer in pending if transfer.ok and transfer.ledger_key]
+            )
+    _emit_results([transfer for transfer in named if not (transfer.ok and transfer.item_id)])
+
+    to_mark = [transfer for transfer in transfers if transfer.ok and transfer.item_id]
+    _start_stage("mealie", len(to_mark))
+    await _mark_done_in_chunks(settings, to_mark, semaphore)
+    if ledger is not None:
+        await asyncio.to_thread(
+            ledger.forget, [transfer.ledger_key for transfer in transfers if transfer.mealie_state == "done"]
+        )
+
+    results: List[Dict[str, Any]] = []
+    with tracing.span("log_write", items=len(transfers)):
+        for transfer in transfers:
+            payload = _log_transfer(settings, transfer)
+            if payload is not None:
+                results.append(payload)
+    client = get_http_client(settings)
+    for service in ("bring", "mealie"):
+        if client.breaker(service).is_open:
+            _log_service_unavailable(settings, service)
+
+    return results
+
+
+async def _stream_sync(trigger: str, pair_name: Optional[str]) -> AsyncIterator[Dict[str, Any]]:
+    settings = get_settings()
+    pairs = [pair for pair in settings.list_pairs if pair_name is None or pair.name == pair_name]
+    started = time.perf_counter()
+    completed: asyncio.Queue = asyncio.Queue()
+    runs = asyncio.ensure_future(
+        asyncio.gather(*(_sync_pair(settings, pair, trigger, completed.put_nowait) for pair in pairs))
+    )
+    runs.add_done_callback(lambda _: completed.put_nowait(None))
+    while True:
+        payload = await completed.get()
+        if payload is None:
+            break
+        yield {"type": "item", **payload}
+    results = [payload for per_pair in await runs for payload in per_pair]
+    failed = sum(1 for payload in results if payload["status"] != "ok")
+    yield {
+        "type": "summary",
+        "status": "completed",
+        "trigger": trigger,
+        "pairs": [pair.name for pair in pairs],
+        "items": len(results),
+        "ok": len(results) - failed,
+        "failed": failed,
+        "duration_ms": round((time.perf_counter() - started) * 1000, 3),
+        "results": results,
+    }
+
+
+async def stream_sync(trigger: str = "scheduler", pair_name: Optional[str] = None) -> AsyncIterator[Dict[str, Any]]:
+    async for record in _stream_sync(trigger, pair_name):
+        if record["type"] == "summary":
+            record = {key: value for key, value in record.items() if key != "results"}
+        yield record
 
-        results: List[Dict[str, Any]] = []
-        for item in open_items:
-
-            name, note, item_id, quantity, unit = _extract_item_details(item)
-            if not name:
-                _log_event(settings, "WARN", "log.item_missing_name", {"itemId": item_id})
-                continue
-
-            ok = await _bring_add_item(auth, name, note)
-            status = "ok" if ok else "error"
-
-            mealie_state = "-"
-            if ok and item_id:
-                done = await _mealie_mark_done(settings, item)
-                mealie_state = "done" if done else "open"
-                if done:
-                    _log_event(settings, "INFO", "log.mealie_mark_done", {
-                        "itemId": item_id,
-                        "name": name,
-                    })
-                else:
-                    _log_event(settings, "WARN", "log.mealie_mark_failed", {
-                        "itemId": item_id,
-                        "name": name,
-                    })
-            elif ok:
-                mealie_state = "skipped"
-
-            if ok:
-                _log_event(settings, "INFO", "log.bring_item_transferred", {
-                    "itemId": item_id,
-                    "name": name,
-                    "note": note,
-                })
-            else:
-                _log_event(settings, "ERROR", "log.bring_item_failed", {
-                    "itemId": item_id,
-                    "name": name,
-                })
-
-            payload = {
-                "status": status,
-                "name": name,
-                "note": note,
-                "quantity": quantity,
-                "unit": unit,
-                "mealie": mealie_state,
-                "itemId": item_id,
-            }
-            _log_item(settings, payload)
-            results.append(payload)
 
-        return results
+async def sync_mealie_to_bring(trigger: str = "scheduler", pair_name: Optional[str] = None) -> List[Dict[str, Any]]:
+    results: List[Dict[str, Any]] = []
+    async for record in _stream_sync(trigger, pair_name):
+        if record["type"] == "summary":
+            results = record["results"]
+    return results
@@ -0,0 +1,87 @@
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from dataclasses import asdict, dataclass, field
+from datetime import datetime, timezone
+from typing import Any, Dict, Iterator, List, Optional
+from uuid import uuid4
+
+from .log_store import epoch_ms
+
+
+@dataclass
+class Span:
+    name: str
+    start_ms: float
+    duration_ms: float = 0.0
+    attributes: Dict[str, Any] = field(default_factory=dict)
+
+
+class Trace:
+    def __init__(self, pair: str, trigger: str) -> None:
+        self.id = uuid4().hex
+        self.pair = pair
+        self.trigger = trigger
+        self.started_at = datetime.now(timezone.utc)
+        self.duration_ms = 0.0
+        self.attributes: Dict[str, Any] = {}
+        self.spans: List[Span] = []
+        self._origin = time.perf_counter()
+
+    def elapsed_ms(self) -> float:
+        return (time.perf_counter() - self._origin) * 1000
+
+    def finish(self, **attributes: Any) -> None:
+        self.duration_ms = round(self.elapsed_ms(), 3)
+        self.attributes.update(attributes)
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "id": self.id,
+            "timestamp": self.started_at.isoformat(),
+            "ts": epoch_ms(self.started_at),
+            "pair": self.pair,
+            "trigger": self.trigger,
+            "duration_ms": self.duration_ms,
+            **self.attributes,
+            "spans": [asdict(span) for span in sorted(self.spans, key=lambda span: span.start_ms)],
+        }
+
+
+_CURRENT_TRACE: ContextVar[Optional[Trace]] = ContextVar("mealie2bring_trace", default=None)
+_CURRENT_SPAN: ContextVar[Optional[Span]] = ContextVar("mealie2bring_span", default=None)
+
+
+def start_trace(pair: str, trigger: str) -> Trace:
+    trace = Trace(pair, trigger)
+    _CURRENT_TRACE.set(trace)
+    return trace
+
+
+def end_trace() -> None:
+    _CURRENT_TRACE.set(None)
+
+
+@contextmanager
+def span(name: str, **attributes: Any) -> Iterator[Optional[Span]]:
+    trace = _CURRENT_TRACE.get()
+    if trace is None:
+        yield None
+        return
+    current = Span(name=name, start_ms=round(trace.elapsed_ms(), 3), attributes=attributes)
+    trace.spans.append(current)
+    token = _CURRENT_SPAN.set(current)
+    try:
+        yield current
+    except Exception as error:
+        current.attributes["error"] = type(error).__name__
+        raise
+    finally:
+        current.duration_ms = round(trace.elapsed_ms() - current.start_ms, 3)
+        _CURRENT_SPAN.reset(token)
+
+
+def annotate(**attributes: Any) -> None:
+    current = _CURRENT_SPAN.get()
+    if current is not None:
+        current.attributes.update(attributes)
@@ -0,0 +1,109 @@
+import argparse
+import asyncio
+import os
+import sys
+import tempfile
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, List, Tuple
+
+from .stubs import StubConfig, StubServer, make_items
+from .sync_bench import ROOT, _configure
+
+ITEMS = 6
+REJECTED = "Food 1"
+
+
+@dataclass
+class Scenario:
+    name: str
+    batch_status: int = 200
+    rejected_items: Tuple[str, ...] = ()
+    checks: List[Tuple[str, Callable[[StubServer, List[Dict[str, Any]]], bool]]] = field(default_factory=list)
+
+
+def _statuses(results: List[Dict[str, Any]]) -> Dict[str, str]:
+    return {result["name"]: result["status"] for result in results}
+
+
+def _checked(stub: StubServer) -> Dict[str, bool]:
+    return {item["food"]["name"]: item["checked"] for item in stub.items}
+
+
+SCENARIOS = [
+    Scenario("batch_success", checks=[
+        ("one batch request", lambda stub, results: stub.requests["bring_add_batch"] == 1),
+        ("no single requests", lambda stub, results: stub.requests["bring_add"] == 0),
+        ("all items ok", lambda stub, results: set(_statuses(results).values()) == {"ok"}),
+        ("all items checked off", lambda stub, results: all(_checked(stub).values())),
+    ]),
+    Scenario("batch_fallback", batch_status=400, checks=[
+        ("one batch request", lambda stub, results: stub.requests["bring_add_batch"] == 1),
+        ("one single request per item", lambda stub, results: stub.requests["bring_add"] == ITEMS),
+        ("all items ok", lambda stub, results: set(_statuses(results).values()) == {"ok"}),
+        ("all items on Bring", lambda stub, results: len(stub.bring) == ITEMS),
+        ("all items checked off", lambda stub, results: all(_checked(stub).values())),
+    ]),
+    Scenario("single_rejected", batch_status=400, rejected_items=(REJECTED,), checks=[
+        ("rejected item failed", lambda stub, results: _statuses(results)[REJECTED] == "error"),
+        ("rejected item left open", lambda stub, results: not _checked(stub)[REJECTED]),
+        ("rejected item not on Bring", lambda stub, results: REJECTED not in stub.bring),
+        ("other items ok", lambda stub, results: all(
+            status == "ok" for name, status in _statuses(results).items() if name != REJECTED
+        )),
+        ("other items checked off", lambda stub, results: all(
+            checked for name, checked in _checked(stub).items() if name != REJECTED
+        )),
+    ]),
+    Scenario("batch_unauthorized", batch_status=401, checks=[
+        ("one renewal", lambda stub, results: stub.requests["bring_login"] == 1),
+        ("no single requests", lambda stub, results: stub.requests["bring_add"] == 0),
+        ("all items failed", lambda stub, results: set(_statuses(results).values()) == {"error"}),
+        ("nothing checked off", lambda stub, results: not any(_checked(stub).values())),
+    ]),
+]
+
+
+async def _run(verbose: bool) -> int:
+    stub = StubServer(StubConfig(items=ITEMS))
+    base_url = await stub.start()
+    failures = 0
+    with tempfile.TemporaryDirectory() as data_dir:
+        os.environ.setdefault("BRING_BATCH_SIZE", "50")
+        _configure(base_url, data_dir)
+        sys.path.insert(0, str(ROOT))
+        from app.http_client import close_http_client
+        from app.log_store import close_log_writer, get_log_writer
+        from app.settings import get_settings
+        from app.sync import BRING_AUTH_CACHE, sync_mealie_to_bring
+
+        get_log_writer(get_settings()).start()
+        await BRING_AUTH_CACHE.get(get_settings())
+        for scenario in SCENARIOS:
+            stub.config.batch_status = scenario.batch_status
+            stub.config.rejected_items = scenario.rejected_items
+            stub.items = make_items(ITEMS)
+            stub.bring.clear()
+            stub.requests.clear()
+            results = await sync_mealie_to_bring("check")
+            print(scenario.name)
+            for label, check in scenario.checks:
+                passed = check(stub, results)
+                failures += not passed
+                print(f"  {'ok  ' if passed else 'FAIL'} {label}")
+            if verbose:
+                print(f"  requests: {dict(sorted(stub.requests.items()))}")
+        await close_log_writer()
+        await close_http_client()
+    await stub.stop()
+    return failures
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Check the Bring batch and single-item paths against local stubs")
+    parser.add_argument("--verbose", action="store_true", help="print request counts per scenario")
+    args = parser.parse_args()
+    sys.exit(1 if asyncio.run(_run(args.verbose)) else 0)
+
+
+if __name__ == "__main__":
+    main()
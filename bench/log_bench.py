@@ -0,0 +1,174 @@
+import argparse
+import json
+import os
+import random
+import subprocess
+import sys
+import tempfile
+import time
+import tracemalloc
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Tuple
+
+ROOT = Path(__file__).resolve().parent.parent
+DEFAULT_SIZES = [10_000, 100_000, 1_000_000]
+RETENTION_DAYS = 30
+ITEM_STATUSES = ["ok", "ok", "ok", "error"]
+EVENT_KEYS = ["log.bring_item_transferred", "log.mealie_mark_done", "log.mealie_mark_failed"]
+
+
+def _entry(index: int, timestamp: datetime, rng: random.Random) -> Dict[str, Any]:
+    if index % 10 == 0:
+        return {
+            "timestamp": timestamp.isoformat(),
+            "level": "INFO",
+            "type": "event",
+            "message_key": "log.sync_started",
+            "context": {"trigger": "scheduler"},
+        }
+    if index % 2:
+        status = rng.choice(ITEM_STATUSES)
+        return {
+            "timestamp": timestamp.isoformat(),
+            "type": "item",
+            "status": status,
+            "name": f"Food {index % 500}",
+            "note": "250 g",
+            "quantity": "250",
+            "unit": "g",
+            "bring": "sent" if status == "ok" else "-",
+            "mealie": "done" if status == "ok" else "-",
+            "itemId": f"item-{index}",
+        }
+    return {
+        "timestamp": timestamp.isoformat(),
+        "level": "INFO",
+        "type": "event",
+        "message_key": rng.choice(EVENT_KEYS),
+        "context": {"itemId": f"item-{index}", "name": f"Food {index % 500}"},
+    }
+
+
+def write_history(path: Path, count: int, seed: int = 1) -> None:
+    rng = random.Random(seed)
+    now = datetime.now(timezone.utc)
+    span = timedelta(days=RETENTION_DAYS * 1.2)
+    step = span / count
+    start = now - span
+    with path.open("w", encoding="utf-8") as handle:
+        for index in range(count):
+            entry = _entry(index, start + step * index, rng)
+            handle.write(json.dumps(entry, ensure_ascii=False) + "\n")
+
+
+def _measure(name: str, call: Callable[[], Any], allocations: bool) -> Tuple[Dict[str, Any], Any]:
+    if allocations:
+        tracemalloc.start()
+    started = time.perf_counter()
+    result = call()
+    elapsed = time.perf_counter() - started
+    row: Dict[str, Any] = {"step": name, "ms": round(elapsed * 1000, 2)}
+    if allocations:
+        _, peak = tracemalloc.get_traced_memory()
+        snapshot = tracemalloc.take_snapshot()
+        tracemalloc.stop()
+        row["peak_kib"] = round(peak / 1024, 1)
+        row["live_blocks"] = sum(stat.count for stat in snapshot.statistics("filename"))
+    return row, result
+
+
+def _run_once(count: int, allocations: bool, seed: int) -> Dict[str, Any]:
+    with tempfile.TemporaryDirectory() as data_dir:
+        log_path = Path(data_dir) / "mealie_bring_sync.log"
+        started = time.perf_counter()
+        write_history(log_path, count, seed)
+        generate_ms = round((time.perf_counter() - started) * 1000, 2)
+        os.environ.update({
+            "LOG_PATH": str(log_path),
+            "LOG_RETENTION_DAYS": str(RETENTION_DAYS),
+            "LEDGER_PATH": f"{data_dir}/ledger.sqlite3",
+            "BRING_AUTH_CACHE_PATH": f"{data_dir}/bring_auth.json",
+            "SYNC_INTERVAL_MINUTES": "0",
+        })
+        sys.path.insert(0, str(ROOT))
+        from fastapi.testclient import TestClient
+
+        from app.log_store import get_log_store
+        from app.main import app
+        from app.settings import get_settings
+        from app.sync import _prune_log_entries, load_log_entries
+
+        settings = get_settings()
+        client = TestClient(app)
+        source_bytes = log_path.stat().st_size
+        steps: List[Dict[str, Any]] = []
+
+        row, _ = _measure("migrate", lambda: get_log_store(settings).load_next_id(), allocations)
+        steps.append(row)
+        row, pruned = _measure("prune", lambda: _prune_log_entries(settings), allocations)
+        row["rows"] = pruned
+        steps.append(row)
+        row, entries = _measure("load", lambda: load_log_entries(settings), allocations)
+        row["rows"] = len(entries)
+        steps.append(row)
+        del entries
+        for name in ("dashboard_cold", "dashboard_warm"):
+            row, response = _measure(name, lambda: client.get("/"), allocations)
+            row["bytes"] = len(response.content)
+            steps.append(row)
+        row, response = _measure("api_log", lambda: client.get("/api/log", params={"type": "item"}), allocations)
+        row["bytes"] = len(response.content)
+        steps.append(row)
+
+        store_bytes = sum(path.stat().st_size for path in Path(data_dir).glob("*.sqlite3*"))
+        return {
+            "entries": count,
+            "generate_ms": generate_ms,
+            "source_bytes": source_bytes,
+            "store_bytes": store_bytes,
+            "steps": steps,
+        }
+
+
+def _run_child(args: argparse.Namespace, count: int) -> Dict[str, Any]:
+    command = [sys.executable, "-m", "bench.log_bench", "--child", "--entries", str(count), "--seed", str(args.seed)]
+    if args.no_allocations:
+        command.append("--no-allocations")
+    completed = subprocess.run(command, cwd=ROOT, capture_output=True, text=True, check=True)
+    return json.loads(completed.stdout.strip().splitlines()[-1])
+
+
+def _print_report(result: Dict[str, Any]) -> None:
+    print(
+        f"{result['entries']:,} entries · JSONL {result['source_bytes'] / 1048576:.1f} MiB "
+        f"-> SQLite {result['store_bytes'] / 1048576:.1f} MiB"
+    )
+    for step in result["steps"]:
+        extra = " ".join(f"{key}={step[key]}" for key in ("rows", "bytes", "peak_kib", "live_blocks") if key in step)
+        print(f"  {step['step']:<15} {step['ms']:>10.1f} ms  {extra}")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Benchmark the log store and dashboard with large synthetic histories")
+    parser.add_argument("--entries", type=int, nargs="+", default=DEFAULT_SIZES)
+    parser.add_argument("--seed", type=int, default=1)
+    parser.add_argument("--no-allocations", action="store_true", help="skip tracemalloc for undistorted timings")
+    parser.add_argument("--json", action="store_true")
+    parser.add_argument("--child", action="store_true", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.child:
+        print(json.dumps(_run_once(args.entries[0], not args.no_allocations, args.seed)))
+        return
+
+    for count in args.entries:
+        result = _run_child(args, count)
+        if args.json:
+            print(json.dumps(result))
+        else:
+            _print_report(result)
+
+
+if __name__ == "__main__":
+    main()
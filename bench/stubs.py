@@ -0,0 +1,140 @@
+import asyncio
+import random
+import time
+from collections import Counter
+from dataclasses import dataclass
+from typing import Any, Dict, List, Optional, Tuple
+
+from aiohttp import web
+
+
+@dataclass
+class StubConfig:
+    items: int = 100
+    latency_ms: float = 0.0
+    error_rate: float = 0.0
+    seed: int = 1
+    batch_status: int = 200
+    rejected_items: Tuple[str, ...] = ()
+
+
+def make_items(count: int) -> List[Dict[str, Any]]:
+    units = ["g", "ml", "Stück", None]
+    return [
+        {
+            "id": f"item-{index}",
+            "checked": False,
+            "food": {"name": f"Food {index}"},
+            "quantity": 1 + index % 5,
+            "unit": {"name": units[index % len(units)]} if units[index % len(units)] else None,
+        }
+        for index in range(count)
+    ]
+
+
+class StubServer:
+    def __init__(self, config: StubConfig) -> None:
+        self.config = config
+        self.items = make_items(config.items)
+        self.bring: Dict[str, str] = {}
+        self.requests: Counter = Counter()
+        self.done_at: Dict[str, float] = {}
+        self._random = random.Random(config.seed)
+        self._runner: Optional[web.AppRunner] = None
+        self.base_url = ""
+
+    async def _delay(self) -> None:
+        if self.config.latency_ms > 0:
+            await asyncio.sleep(self.config.latency_ms / 1000)
+
+    def _fails(self) -> bool:
+        return self.config.error_rate > 0 and self._random.random() < self.config.error_rate
+
+    async def _mealie_list(self, request: web.Request) -> web.Response:
+        self.requests["mealie_fetch"] += 1
+        await self._delay()
+        return web.json_response({"id": request.match_info["list_id"], "listItems": self.items})
+
+    async def _mealie_items(self, request: web.Request) -> web.Response:
+        self.requests["mealie_mark_done"] += 1
+        payload = await request.json()
+        await self._delay()
+        if self._fails():
+            return web.Response(status=503)
+        now = time.perf_counter()
+        done = {item["id"] for item in payload if item.get("checked")}
+        for item in self.items:
+            if item["id"] in done:
+                item["checked"] = True
+                self.done_at.setdefault(item["id"], now)
+        return web.json_response({"updatedItems": payload})
+
+    async def _bring_auth(self, request: web.Request) -> web.Response:
+        self.requests["bring_login"] += 1
+        await self._delay()
+        return web.json_response({
+            "uuid": "bench-user",
+            "bringListUUID": "bench-list",
+            "access_token": "bench-token",
+            "refresh_token": "bench-refresh",
+            "expires_in": 3600,
+        })
+
+    async def _bring_token(self, request: web.Request) -> web.Response:
+        self.requests["bring_refresh"] += 1
+        await self._delay()
+        return web.json_response({"access_token": "bench-token", "expires_in": 3600})
+
+    async def _bring_get(self, request: web.Request) -> web.Response:
+        self.requests["bring_fetch"] += 1
+        await self._delay()
+        purchase = [{"name": name, "specification": spec} for name, spec in self.bring.items()]
+        return web.json_response({"uuid": request.match_info["list_uuid"], "purchase": purchase, "recently": []})
+
+    async def _bring_put(self, request: web.Request) -> web.Response:
+        self.requests["bring_add"] += 1
+        data = await request.post()
+        await self._delay()
+        if self._fails():
+            return web.Response(status=503)
+        if data.get("purchase") in self.config.rejected_items:
+            return web.Response(status=400)
+        self.bring[str(data.get("purchase"))] = str(data.get("specification", ""))
+        return web.Response(status=204)
+
+    async def _bring_batch(self, request: web.Request) -> web.Response:
+        self.requests["bring_add_batch"] += 1
+        payload = await request.json()
+        await self._delay()
+        if self._fails():
+            return web.Response(status=503)
+        if self.config.batch_status != 200:
+            return web.Response(status=self.config.batch_status)
+        for change in payload.get("changes", []):
+            self.bring[change["itemId"]] = change.get("spec", "")
+        return web.Response(status=200)
+
+    def _application(self) -> web.Application:
+        application = web.Application()
+        application.router.add_get("/api/households/shopping/lists/{list_id}", self._mealie_list)
+        application.router.add_put("/api/households/shopping/items", self._mealie_items)
+        application.router.add_post("/rest/v2/bringauth", self._bring_auth)
+        application.router.add_post("/rest/v2/bringauth/token", self._bring_token)
+        application.router.add_get("/rest/v2/bringlists/{list_uuid}", self._bring_get)
+        application.router.add_put("/rest/v2/bringlists/{list_uuid}", self._bring_put)
+        application.router.add_put("/rest/v2/bringlists/{list_uuid}/items", self._bring_batch)
+        return application
+
+    async def start(self) -> str:
+        self._runner = web.AppRunner(self._application(), access_log=None)
+        await self._runner.setup()
+        site = web.TCPSite(self._runner, "127.0.0.1", 0)
+        await site.start()
+        port = site._server.sockets[0].getsockname()[1]
+        self.base_url = f"http://127.0.0.1:{port}"
+        return self.base_url
+
+    async def stop(self) -> None:
+        if self._runner is not None:
+            await self._runner.cleanup()
+        self._runner = None
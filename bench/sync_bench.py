@@ -0,0 +1,131 @@
+import argparse
+import asyncio
+import json
+import os
+import resource
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+from typing import Any, Dict, List
+
+from .stubs import StubConfig, StubServer
+
+ROOT = Path(__file__).resolve().parent.parent
+DEFAULT_SIZES = [10, 100, 1000, 10000]
+BENCH_ENV = {
+    "HTTP_RATE_LIMIT_PER_HOST": "0",
+    "HTTP_RETRY_BASE_DELAY_MS": "10",
+    "HTTP_RETRY_MAX_DELAY_SECONDS": "1",
+    "SYNC_INTERVAL_MINUTES": "0",
+}
+
+
+def _percentile(values: List[float], percent: float) -> float:
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    index = max(0, min(len(ordered) - 1, round(percent / 100 * len(ordered) + 0.5) - 1))
+    return ordered[index]
+
+
+def _configure(base_url: str, data_dir: str) -> None:
+    for key, value in BENCH_ENV.items():
+        os.environ.setdefault(key, value)
+    os.environ.update({
+        "MEALIE_BASE_URL": base_url,
+        "MEALIE_API_TOKEN": "bench-token",
+        "MEALIE_SHOPPING_LIST_ID": "bench-list",
+        "BRING_BASE_URL": base_url,
+        "BRING_EMAIL": "bench@example.com",
+        "BRING_PASSWORD": "bench",
+        "BRING_AUTH_CACHE_PATH": f"{data_dir}/bring_auth.json",
+        "LEDGER_PATH": f"{data_dir}/ledger.sqlite3",
+        "LOG_PATH": f"{data_dir}/mealie_bring_sync.log",
+    })
+
+
+async def _run_once(config: StubConfig) -> Dict[str, Any]:
+    stub = StubServer(config)
+    base_url = await stub.start()
+    with tempfile.TemporaryDirectory() as data_dir:
+        _configure(base_url, data_dir)
+        sys.path.insert(0, str(ROOT))
+        from app.http_client import close_http_client
+        from app.log_store import close_log_writer, get_log_writer
+        from app.settings import get_settings
+        from app.sync import sync_mealie_to_bring
+
+        get_log_writer(get_settings()).start()
+        started = time.perf_counter()
+        results = await sync_mealie_to_bring("benchmark")
+        elapsed = time.perf_counter() - started
+        await close_log_writer()
+        await close_http_client()
+    await stub.stop()
+
+    latencies = [(done_at - started) * 1000 for done_at in stub.done_at.values()]
+    return {
+        "items": config.items,
+        "latency_ms": config.latency_ms,
+        "error_rate": config.error_rate,
+        "seconds": round(elapsed, 4),
+        "items_per_second": round(config.items / elapsed, 1) if elapsed else 0.0,
+        "transferred": sum(1 for result in results if result.get("status") == "ok"),
+        "done": len(stub.done_at),
+        "p50_ms": round(_percentile(latencies, 50), 2),
+        "p99_ms": round(_percentile(latencies, 99), 2),
+        "requests": dict(sorted(stub.requests.items())),
+        "peak_rss_mib": round(resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024, 1),
+    }
+
+
+def _run_child(args: argparse.Namespace, items: int) -> Dict[str, Any]:
+    command = [
+        sys.executable, "-m", "bench.sync_bench", "--child",
+        "--items", str(items),
+        "--latency-ms", str(args.latency_ms),
+        "--error-rate", str(args.error_rate),
+        "--seed", str(args.seed),
+    ]
+    completed = subprocess.run(command, cwd=ROOT, capture_output=True, text=True, check=True)
+    return json.loads(completed.stdout.strip().splitlines()[-1])
+
+
+def _print_table(rows: List[Dict[str, Any]]) -> None:
+    header = f"{'items':>7} {'seconds':>9} {'items/s':>9} {'p50 ms':>9} {'p99 ms':>9} {'done':>7} {'rss MiB':>8}  requests"
+    print(header)
+    for row in rows:
+        requests = " ".join(f"{name}={count}" for name, count in row["requests"].items())
+        print(
+            f"{row['items']:>7} {row['seconds']:>9.3f} {row['items_per_second']:>9.1f} "
+            f"{row['p50_ms']:>9.1f} {row['p99_ms']:>9.1f} {row['done']:>7} {row['peak_rss_mib']:>8.1f}  {requests}"
+        )
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Benchmark sync_mealie_to_bring against local Mealie and Bring stubs")
+    parser.add_argument("--items", type=int, nargs="+", default=DEFAULT_SIZES)
+    parser.add_argument("--latency-ms", type=float, default=0.0)
+    parser.add_argument("--error-rate", type=float, default=0.0)
+    parser.add_argument("--seed", type=int, default=1)
+    parser.add_argument("--json", action="store_true")
+    parser.add_argument("--child", action="store_true", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.child:
+        config = StubConfig(items=args.items[0], latency_ms=args.latency_ms, error_rate=args.error_rate, seed=args.seed)
+        print(json.dumps(asyncio.run(_run_once(config))))
+        return
+
+    rows = [_run_child(args, items) for items in args.items]
+    if args.json:
+        for row in rows:
+            print(json.dumps(row))
+    else:
+        _print_table(rows)
+
+
+if __name__ == "__main__":
+    main()